@@ -1,19 +1,14 @@
 """Mix-in class."""
 import sublime
-from . lib import colorbox
 from . import ch_util as util
+from . import ch_swatch
 from .ch_util import GAMUT_SPACES
 from .lib.multiconf import get as qualify_settings
 from .lib.coloraide import Color
-from collections import namedtuple
 
 SPACER = Color("transparent")
 
 
-class Preview(namedtuple('Preview', ['preview1', 'preview2', 'border', 'message'])):
-    """Preview."""
-
-
 class _ColorMixin:
     """Color box mix-in class."""
 
@@ -30,28 +25,13 @@ class _ColorMixin:
         """Setup_image_border."""
 
         ch_settings = sublime.load_settings('color_helper.sublime-settings')
-        border_color = ch_settings.get('image_border_color')
-        if border_color is not None:
-            try:
-                border_color = Color(border_color)
-                border_color.fit(self.gamut_space, in_place=True)
-            except Exception:
-                border_color = None
-
-        if border_color is None:
-            # Calculate border color for images
-            border_color = Color(
-                self.view.style()['background'],
-                filters=util.CSS_SRGB_SPACES
-            ).convert("hsl")
-            border_color.lightness = border_color.lightness + (0.3 if border_color.luminance() < 0.5 else -0.3)
-
-        self.default_border = border_color.convert(self.gamut_space, in_place=True)
-        self.out_of_gamut = Color("transparent").convert(self.gamut_space, in_place=True)
-        self.out_of_gamut_border = Color(
-            self.view.style().get('redish', "red"),
-            filters=util.CSS_SRGB_SPACES
-        ).convert(self.gamut_space, in_place=True)
+        style = self.view.style()
+        self.default_border = ch_swatch.get_border(
+            style['background'], self.gamut_space, ch_settings.get('image_border_color')
+        )
+        self.out_of_gamut, self.out_of_gamut_border = ch_swatch.get_out_of_gamut(
+            style.get('redish', "red"), self.gamut_space
+        )
 
     def get_color_options(self, pt, rule):
         """Get color class based on selection scope."""
@@ -118,7 +98,7 @@ class _ColorMixin:
     def get_spacer(self, width=1, height=1):
         """Get a spacer."""
 
-        return colorbox.color_box(
+        return ch_swatch.color_box(
             [SPACER.convert(self.gamut_space)], border_size=0,
             height=self.height * height, width=self.width * width,
             check_size=self.check_size(self.height), alpha=True,
@@ -173,28 +153,15 @@ class _ColorMixin:
             check_size = 2
         return check_size
 
+    def get_swatch_style(self):
+        """Get the swatch style."""
+
+        return ch_swatch.SwatchStyle(
+            self.gamut_space, self.show_out_of_gamut_preview, self.default_border,
+            self.out_of_gamut, self.out_of_gamut_border
+        )
+
     def get_preview(self, color):
         """Get preview."""
 
-        message = ''
-        preview_border = self.default_border
-        if self.gamut_space == 'srgb':
-            check_space = self.gamut_space if color.space() not in util.SRGB_SPACES else color.space()
-        else:
-            check_space = self.gamut_space
-        if not color.in_gamut(check_space):
-            message = 'preview out of gamut'
-            if self.show_out_of_gamut_preview:
-                pcolor = color.convert(self.gamut_space, fit=True)
-                preview1 = pcolor.clone().set('alpha', 1)
-                preview2 = pcolor
-            else:
-                preview1 = self.out_of_gamut
-                preview2 = self.out_of_gamut
-                preview_border = self.out_of_gamut_border
-        else:
-            pcolor = color.convert(self.gamut_space, fit=True)
-            preview1 = pcolor.clone().set('alpha', 1)
-            preview2 = pcolor
-
-        return Preview(preview1, preview2, preview_border, message)
+        return ch_swatch.get_preview(color, self.get_swatch_style())
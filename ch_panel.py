@@ -7,7 +7,7 @@ License: MIT
 import sublime
 import sublime_plugin
 import mdpopups
-from .lib import colorbox
+from . import ch_swatch
 from html.parser import HTMLParser
 from .lib.coloraide import Color
 from .lib.coloraide import __version_info__ as color_ver
@@ -246,7 +246,7 @@ class ColorHelperCommand(_ColorMixin, sublime_plugin.TextCommand):
 
         if self.os_color_picker:
             self.view.hide_popup()
-            new_color = native_picker(Color(color).convert("srgb", fit=True))
+            new_color = native_picker(ch_swatch.fit(Color(color), "srgb"))
             if new_color is not None:
                 sublime.set_timeout(
                     lambda c=new_color.to_string(**util.COLOR_FULL_PREC): self.view.run_command(
@@ -374,7 +374,7 @@ class ColorHelperCommand(_ColorMixin, sublime_plugin.TextCommand):
 
         colors.append(
             '[{}]({})'.format(
-                colorbox.color_box(
+                ch_swatch.color_box(
                     color_box, self.default_border,
                     height=self.height * PALETTE_SCALE_Y, width=self.palette_w * PALETTE_SCALE_X,
                     border_size=BORDER_SIZE, check_size=self.check_size(self.height * PALETTE_SCALE_Y)
@@ -411,9 +411,8 @@ class ColorHelperCommand(_ColorMixin, sublime_plugin.TextCommand):
             if delete:
                 colors.append(
                     '[{}](__delete_color__:{}:{}:{} "{}")'.format(
-                        colorbox.color_box(
-                            [preview.preview1, preview.preview2],
-                            preview.border, height=height, width=width, border_size=BORDER_SIZE,
+                        ch_swatch.preview_box(
+                            preview, height=height, width=width, border_size=BORDER_SIZE,
                             check_size=check_size
                         ),
                         f, palette_type, label, message
@@ -422,9 +421,8 @@ class ColorHelperCommand(_ColorMixin, sublime_plugin.TextCommand):
             else:
                 colors.append(
                     '[{}](__insert__:{}:{}:{} "{}")'.format(
-                        colorbox.color_box(
-                            [preview.preview1, preview.preview2],
-                            preview.border, height=height, width=width, border_size=BORDER_SIZE,
+                        ch_swatch.preview_box(
+                            preview, height=height, width=width, border_size=BORDER_SIZE,
                             check_size=check_size
                         ), f, palette_type, label, message
                     )
@@ -482,8 +480,8 @@ class ColorHelperCommand(_ColorMixin, sublime_plugin.TextCommand):
         if preview.message:
             message = '<p class="comment">* {}</p>'.format(preview.message)
         template_vars['color_preview'] = (
-            colorbox.color_box(
-                [preview.preview1, preview.preview2], preview.border,
+            ch_swatch.preview_box(
+                preview,
                 height=self.height * PREVIEW_SCALE, width=self.width * PREVIEW_SCALE,
                 border_size=BORDER_SIZE, check_size=self.check_size(self.height * PREVIEW_SCALE, scale=8)
             )
@@ -8,22 +8,68 @@ import sublime
 import sublime_plugin
 import mdpopups
 from .lib import colorbox
-from .lib.coloraide import Color
+from . import ch_swatch
+from .lib.coloraide import Color, ColorValue
+from .lib.coloraide.value import convert_values, channel_attr
 from .lib.coloraide import util as cutil
 from .lib.coloraide import algebra as alg
 from .lib.coloraide.css import color_names as css_names
 from . import ch_util as util
 from .ch_mixin import _ColorMixin
 from .ch_util import DEFAULT, COLOR_FULL_PREC, EXTENDED_SRGB_SPACES
+from collections import namedtuple, OrderedDict
 import copy
 
-color_map = None
-color_map_size = False
-line_height = None
-default_border = None
-color_scale = None
+color_maps = OrderedDict()
+color_names = OrderedDict()
 
 BORDER_SIZE = 1
+COLOR_MAP_CACHE_SIZE = 32
+HIRES_WINDOW = 32
+COLOR_NAMES_CACHE_SIZE = 8
+ALL_BORDERS = colorbox.TOP | colorbox.LEFT | colorbox.BOTTOM | colorbox.RIGHT
+
+
+class ColorMapCell(namedtuple('ColorMapCell', ['color', 'coords', 'value', 'href', 'border_map'])):
+    """Color map cell."""
+
+
+class ColorMap:
+    """
+    Rendered color map grid.
+
+    Keeps the rendered cells, and the rows and marked cells as they were last shown.
+    """
+
+    def __init__(self, cells, html):
+        """Initialize."""
+
+        self.cells = cells
+        self.html = html
+        self.shown = [''.join(row) for row in html]
+        self.marked = {}
+
+
+def clear_cache():
+    """Clear the rendered color maps and color names, as they depend on how swatches are rendered."""
+
+    color_maps.clear()
+    color_names.clear()
+
+
+def get_grid_border_map(x, y):
+    """Get the borders of a color map grid cell, which only has borders on the outside of the grid."""
+
+    border_map = 0
+    if y == 0:
+        border_map |= colorbox.TOP
+    elif y == 16:
+        border_map |= colorbox.BOTTOM
+    if x == 0:
+        border_map |= colorbox.LEFT
+    elif x == 16:
+        border_map |= colorbox.RIGHT
+    return border_map
 
 
 def get_color_picker_modes():
@@ -70,7 +116,7 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         self.setup_controls(controls)
         color.convert(self.mode, in_place=True)
         if not color.in_gamut():
-            color.fit(in_place=True)
+            color = ch_swatch.fit(color, self.mode)
         else:
             color.clip(in_place=True)
         # Ensure hue is between 0 - 360.
@@ -101,15 +147,72 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
             controls = 'box'
         self.controls = controls
 
+    def get_color_map_grid(self, key, generate, marker):
+        """
+        Get the rows of the color map grid.
+
+        The grid's colors only depend on `key` and the picker's graphic settings, so the most recently
+        used grids are kept, and when the selection moves, only the previously and newly marked cells
+        are rendered again. `generate` yields the rows of colors, as `ColorValue`s, and `marker` gives
+        the border of a marked cell or `None`.
+        """
+
+        check_size = self.check_size(self.height)
+        key = key + (self.gamut_space, self.height, self.width, check_size, colorbox.color_key(self.default_border))
+        color_map = color_maps.get(key)
+        if color_map is None:
+            cells = []
+            html = []
+            for y, colors in enumerate(generate()):
+                cells.append([])
+                html.append([])
+                for x, (color, value) in enumerate(zip(colors, convert_values(Color, colors, self.gamut_space))):
+                    color = color.to_color(Color)
+                    cell = ColorMapCell(
+                        color, tuple(color.coords()), value.to_color(Color),
+                        color.to_string(**COLOR_FULL_PREC), get_grid_border_map(x, y)
+                    )
+                    cells[-1].append(cell)
+                    html[-1].append(self.get_color_map_cell(cell, self.default_border, cell.border_map, check_size))
+            color_map = ColorMap(cells, html)
+            color_maps[key] = color_map
+            while len(color_maps) > COLOR_MAP_CACHE_SIZE:
+                color_maps.popitem(last=False)
+        else:
+            color_maps.move_to_end(key)
+
+        marked = {}
+        for y, cells in enumerate(color_map.cells):
+            for x, cell in enumerate(cells):
+                border_color = marker(cell)
+                if border_color is not None:
+                    marked[(y, x)] = self.get_color_map_cell(cell, border_color, ALL_BORDERS, check_size)
+
+        if marked != color_map.marked:
+            # Only the rows of the previously and newly marked cells need to change.
+            for y in set(y for y, x in marked) | set(y for y, x in color_map.marked):
+                row = list(color_map.html[y])
+                for x in range(len(row)):
+                    row[x] = marked.get((y, x), row[x])
+                color_map.shown[y] = ''.join(row)
+            color_map.marked = marked
+        return list(color_map.shown)
+
+    def get_color_map_cell(self, cell, border_color, border_map, check_size):
+        """Get a color map cell."""
+
+        return '<a href="{}">{}</a>'.format(
+            cell.href,
+            ch_swatch.color_box(
+                [cell.value], border_color,
+                border_size=BORDER_SIZE, height=self.height, width=self.width,
+                check_size=check_size, border_map=border_map
+            )
+        )
+
     def get_color_map_square_hsv(self, mode='hsv'):
         """Get a square variant of the color map."""
 
-        global color_map
-        global color_map_size
-        global line_height
-        global default_border
-        global color_scale
-
         hue, saturation, value = alg.no_nans(self.color.convert(mode).coords())
 
         r_sat = saturation
@@ -120,252 +223,141 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
                 break
             r_hue += 22.4375
 
-        # Only update if the last time we rendered we changed
-        # something that would require a new render.
-        if (True):
-            color_map_size = self.graphic_size
-            color_scale = self.graphic_scale
-
-            line_height = self.line_height
-            default_border = self.default_border
+        def generate():
+            """Generate the colors with each row being darker than the last, and each column more saturated."""
 
-            html_colors = []
-
-            # Generate the colors with each row being darker than the last.
-            # Each column will progress through hues.
-            color = Color(mode, [r_hue, 0, 1], filters=util.EXTENDED_SRGB_SPACES)
-            if color.is_nan("hue"):
-                color.hue = 0.0
-            check_size = self.check_size(self.height)
+            value = 1
             for y in range(0, 17):
-                html_colors.append([])
+                row = []
+                saturation = 0
                 for x in range(0, 17):
-                    this_sat = abs(color.saturation - r_sat) < 0.03125
-                    this_val = abs(color.value - r_val) < 0.03125
-                    border_color = self.default_border
-                    if this_sat and this_val:
-                        lum = color.luminance()
-                        border_color = Color(self.gamut_space, [1, 1, 1] if lum < 0.5 else [0, 0, 0])
-                    value = color.convert(self.gamut_space)
-                    kwargs = {
-                        "border_size": BORDER_SIZE, "height": self.height, "width": self.width,
-                        "check_size": check_size
-                    }
-
-                    if this_val and this_sat:
-                        border_map = colorbox.TOP | colorbox.LEFT | colorbox.BOTTOM | colorbox.RIGHT
-                    elif y == 0 and x == 0:
-                        border_map = colorbox.TOP | colorbox.LEFT
-                    elif y == 0 and x == 16:
-                        border_map = colorbox.TOP | colorbox.RIGHT
-                    elif y == 0:
-                        border_map = colorbox.TOP
-                    elif y == 16 and x == 0:
-                        border_map = colorbox.BOTTOM | colorbox.LEFT
-                    elif y == 16 and x == 16:
-                        border_map = colorbox.BOTTOM | colorbox.RIGHT
-                    elif y == 16:
-                        border_map = colorbox.BOTTOM
-                    elif x == 0:
-                        border_map = colorbox.LEFT
-                    elif x == 16:
-                        border_map = colorbox.RIGHT
-                    else:
-                        border_map = 0
-                    kwargs["border_map"] = border_map
-
-                    html_colors[-1].append(
-                        '<a href="{}">{}</a>'.format(
-                            color.to_string(**COLOR_FULL_PREC),
-                            colorbox.color_box(
-                                [value], border_color,
-                                **kwargs
-                            )
-                        )
-                    )
-                    color.saturation = min(color.saturation + 0.0625, 1)
-                    color.hue = r_hue
-                color.value = max(color.value - 0.0625, 0)
-                color.saturation = 0
-                color.hue = r_hue
-
-            # Generate a hue bar.
-            color = Color(mode, [0, 1, 1], filters=util.EXTENDED_SRGB_SPACES)
-            if color.is_nan("hue"):
-                color.hue = 0.0
-            check_size = self.check_size(self.height)
-            for y in range(0, 17):
-                value = color.convert(self.gamut_space)
-                kwargs = {
-                    "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size
-                }
+                    row.append(ColorValue(mode, r_hue, saturation, value))
+                    saturation = min(saturation + 0.0625, 1)
+                yield row
+                value = max(value - 0.0625, 0)
 
-                this_hue = color.hue == r_hue
-                border_color = self.default_border
-                if this_hue:
-                    lum = color.luminance()
-                    border_color = Color(self.gamut_space, [1, 1, 1] if lum < 0.5 else [0, 0, 0])
-
-                if this_hue:
-                    border_map = colorbox.TOP | colorbox.LEFT | colorbox.BOTTOM | colorbox.RIGHT
-                elif y == 0:
-                    border_map = colorbox.TOP | colorbox.LEFT | colorbox.RIGHT
-                elif y == 16:
-                    border_map = colorbox.BOTTOM | colorbox.LEFT | colorbox.RIGHT
-                else:
-                    border_map = colorbox.LEFT | colorbox.RIGHT
-                kwargs["border_map"] = border_map
-
-                color.value = r_val
-                color.saturation = r_sat
-                html_colors[y].append(
-                    '<a href="{}">{}</a>'.format(
-                        color.to_string(**COLOR_FULL_PREC),
-                        colorbox.color_box(
-                            [value], border_color,
-                            **kwargs
-                        )
+        def marker(cell):
+            """Get the border of the selected color."""
+
+            if abs(cell.coords[1] - r_sat) < 0.03125 and abs(cell.coords[2] - r_val) < 0.03125:
+                return Color(self.gamut_space, [1, 1, 1] if cell.color.luminance() < 0.5 else [0, 0, 0])
+            return None
+
+        html_colors = [[row] for row in self.get_color_map_grid((mode, r_hue), generate, marker)]
+
+        # Generate a hue bar, converting all of its colors together.
+        bar = [ColorValue(mode, y * 22.4375, 1, 1) for y in range(0, 17)]
+        check_size = self.check_size(self.height)
+        for y, (color, value) in enumerate(zip(bar, convert_values(Color, bar, self.gamut_space))):
+            value = value.to_color(Color)
+            kwargs = {
+                "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size
+            }
+
+            this_hue = color.c0 == r_hue
+            border_color = self.default_border
+            if this_hue:
+                lum = color.to_color(Color).luminance()
+                border_color = Color(self.gamut_space, [1, 1, 1] if lum < 0.5 else [0, 0, 0])
+
+            if this_hue:
+                border_map = ALL_BORDERS
+            elif y == 0:
+                border_map = colorbox.TOP | colorbox.LEFT | colorbox.RIGHT
+            elif y == 16:
+                border_map = colorbox.BOTTOM | colorbox.LEFT | colorbox.RIGHT
+            else:
+                border_map = colorbox.LEFT | colorbox.RIGHT
+            kwargs["border_map"] = border_map
+
+            html_colors[y].append(
+                '<a href="{}">{}</a>'.format(
+                    Color(mode, [color.c0, r_sat, r_val]).to_string(**COLOR_FULL_PREC),
+                    ch_swatch.color_box(
+                        [value], border_color,
+                        **kwargs
                     )
                 )
-                color.hue = color.hue + 22.4375
-                color.value = 1
-                color.saturation = 1
-
-            color_map = (
-                ''.join(['<span>{}</span><br>'.format(''.join([y1 for y1 in x1])) for x1 in html_colors])
             )
-        self.template_vars['color_picker'] = color_map
+
+        self.template_vars['color_picker'] = (
+            ''.join(['<span>{}</span><br>'.format(''.join([y1 for y1 in x1])) for x1 in html_colors])
+        )
 
     def get_color_map_square(self, mode='hsl'):
         """Get a square variant of the color map."""
 
-        global color_map
-        global color_map_size
-        global line_height
-        global default_border
-        global color_scale
-
         hue, saturation, lightness = alg.no_nans(self.color.convert(mode).coords())
 
         r_sat = saturation
         r_lit = lightness
         scale = 1 if mode != 'hsluv' else 100
 
-        # Only update if the last time we rendered we changed
-        # something that would require a new render.
-        if (True):
-            color_map_size = self.graphic_size
-            color_scale = self.graphic_scale
-
-            line_height = self.line_height
-            default_border = self.default_border
+        def generate():
+            """Generate the colors with each row being less saturated than the last, and each column a new hue."""
 
-            html_colors = []
-
-            # Generate the colors with each row being darker than the last.
-            # Each column will progress through hues.
-            color = Color(mode, [0, 1 * scale, lightness], filters=util.EXTENDED_SRGB_SPACES)
-            if color.is_nan("hue"):
-                color.hue = 0.0
-            check_size = self.check_size(self.height)
+            saturation = 1 * scale
             for y in range(0, 17):
-                html_colors.append([])
+                row = []
+                hue = 0.0
                 for x in range(0, 17):
-                    this_hue = False
-                    this_sat = abs(color.saturation - r_sat) < (0.03125 * scale)
-                    border_color = self.default_border
-                    if this_sat:
-                        this_hue = abs(color.hue - hue) < 11.21875
-                        if this_hue:
-                            lum = color.luminance()
-                            border_color = Color(
-                                self.gamut_space, [1 * scale, 1 * scale, 1 * scale] if lum < 0.5 else [0, 0, 0]
-                            )
-                    value = color.convert(self.gamut_space)
-                    kwargs = {
-                        "border_size": BORDER_SIZE, "height": self.height, "width": self.width,
-                        "check_size": check_size
-                    }
-
-                    if this_hue and this_sat:
-                        border_map = colorbox.TOP | colorbox.LEFT | colorbox.BOTTOM | colorbox.RIGHT
-                    elif y == 0 and x == 0:
-                        border_map = colorbox.TOP | colorbox.LEFT
-                    elif y == 0 and x == 16:
-                        border_map = colorbox.TOP | colorbox.RIGHT
-                    elif y == 0:
-                        border_map = colorbox.TOP
-                    elif y == 16 and x == 0:
-                        border_map = colorbox.BOTTOM | colorbox.LEFT
-                    elif y == 16 and x == 16:
-                        border_map = colorbox.BOTTOM | colorbox.RIGHT
-                    elif y == 16:
-                        border_map = colorbox.BOTTOM
-                    elif x == 0:
-                        border_map = colorbox.LEFT
-                    elif x == 16:
-                        border_map = colorbox.RIGHT
-                    else:
-                        border_map = 0
-                    kwargs["border_map"] = border_map
-
-                    html_colors[-1].append(
-                        '<a href="{}">{}</a>'.format(
-                            color.to_string(**COLOR_FULL_PREC),
-                            colorbox.color_box(
-                                [value], border_color,
-                                **kwargs
-                            )
-                        )
-                    )
-                    color.hue = color.hue + 22.4375
-                color.hue = 0.0
-                color.saturation = color.saturation - (0.0625 * scale)
-
-            # Generate a grayscale bar.
-            color = Color(mode, [hue, saturation, 1 * scale], filters=util.EXTENDED_SRGB_SPACES)
-            if color.is_nan("hue"):
-                color.hue = 0.0
-            check_size = self.check_size(self.height)
-            for y in range(0, 17):
-                value = color.convert(self.gamut_space)
-                kwargs = {
-                    "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size
-                }
+                    row.append(ColorValue(mode, hue, saturation, lightness))
+                    hue = hue + 22.4375
+                yield row
+                saturation = saturation - (0.0625 * scale)
 
-                this_lit = abs(color.lightness - r_lit) < (0.03125 * scale)
-                border_color = self.default_border
-                if this_lit:
-                    lum = color.luminance()
-                    border_color = Color(
-                        self.gamut_space, [1 * scale, 1 * scale, 1 * scale] if lum < 0.5 else [0, 0, 0]
-                    )
+        def marker(cell):
+            """Get the border of the selected color."""
 
-                if this_lit:
-                    border_map = colorbox.TOP | colorbox.LEFT | colorbox.BOTTOM | colorbox.RIGHT
-                elif y == 0:
-                    border_map = colorbox.TOP | colorbox.LEFT | colorbox.RIGHT
-                elif y == 16:
-                    border_map = colorbox.BOTTOM | colorbox.LEFT | colorbox.RIGHT
-                else:
-                    border_map = colorbox.LEFT | colorbox.RIGHT
-                kwargs["border_map"] = border_map
-
-                html_colors[y].append(
-                    '<a href="{}">{}</a>'.format(
-                        color.to_string(**COLOR_FULL_PREC),
-                        colorbox.color_box(
-                            [value], border_color,
-                            **kwargs
-                        )
-                    )
+            if abs(cell.coords[1] - r_sat) < (0.03125 * scale) and abs(cell.coords[0] - hue) < 11.21875:
+                return Color(
+                    self.gamut_space, [1 * scale, 1 * scale, 1 * scale] if cell.color.luminance() < 0.5 else [0, 0, 0]
+                )
+            return None
+
+        html_colors = [[row] for row in self.get_color_map_grid((mode, lightness), generate, marker)]
+
+        # Generate a grayscale bar, converting all of its colors together.
+        bar = [ColorValue(mode, hue, saturation, (1 - y * 0.0625) * scale) for y in range(0, 17)]
+        check_size = self.check_size(self.height)
+        for y, (color, value) in enumerate(zip(bar, convert_values(Color, bar, self.gamut_space))):
+            color = color.to_color(Color)
+            value = value.to_color(Color)
+            kwargs = {
+                "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size
+            }
+
+            this_lit = abs(color.lightness - r_lit) < (0.03125 * scale)
+            border_color = self.default_border
+            if this_lit:
+                lum = color.luminance()
+                border_color = Color(
+                    self.gamut_space, [1 * scale, 1 * scale, 1 * scale] if lum < 0.5 else [0, 0, 0]
                 )
-                color.lightness = color.lightness - (0.0625 * scale)
 
-            color_map = (
-                ''.join(['<span>{}</span><br>'.format(''.join([y1 for y1 in x1])) for x1 in html_colors])
+            if this_lit:
+                border_map = ALL_BORDERS
+            elif y == 0:
+                border_map = colorbox.TOP | colorbox.LEFT | colorbox.RIGHT
+            elif y == 16:
+                border_map = colorbox.BOTTOM | colorbox.LEFT | colorbox.RIGHT
+            else:
+                border_map = colorbox.LEFT | colorbox.RIGHT
+            kwargs["border_map"] = border_map
+
+            html_colors[y].append(
+                '<a href="{}">{}</a>'.format(
+                    color.to_string(**COLOR_FULL_PREC),
+                    ch_swatch.color_box(
+                        [value], border_color,
+                        **kwargs
+                    )
+                )
             )
-        self.template_vars['color_picker'] = color_map
+
+        self.template_vars['color_picker'] = (
+            ''.join(['<span>{}</span><br>'.format(''.join([y1 for y1 in x1])) for x1 in html_colors])
+        )
 
     def get_current_color(self):
         """Get current color."""
@@ -375,7 +367,7 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         preview = self.color.convert(self.gamut_space)
         html = (
             '<span class="current-color">{}</span>'.format(
-                colorbox.color_box(
+                ch_swatch.color_box(
                     [preview.clone().set('alpha', 1), preview],
                     self.default_border,
                     border_size=BORDER_SIZE, height=self.height * 3, width=self.width * 3,
@@ -386,28 +378,46 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         self.template_vars['current_color'] = html
 
     def get_css_color_names(self):
-        """Get CSS color names."""
+        """
+        Get CSS color names.
+
+        The names never change, so the rendered names are kept for the most recently used picker settings.
+        """
 
         check_size = self.check_size(self.height)
-        html = []
-        for name in sorted(css_names.name2val_map):
-            color = Color(name, filters=util.EXTENDED_SRGB_SPACES)
+        key = (self.mode, self.gamut_space, self.height, check_size, colorbox.color_key(self.default_border))
+        html = color_names.get(key)
+        if html is None:
+            html = []
+            for name in sorted(css_names.name2val_map):
+                color = Color(name, filters=util.EXTENDED_SRGB_SPACES)
 
-            html.append(
-                '[{}]({}) {}<br>'.format(
-                    colorbox.color_box(
-                        [color.convert(self.gamut_space)], self.default_border,
-                        border_size=BORDER_SIZE, height=self.height, width=self.height * 8,
-                        check_size=check_size
-                    ),
-                    color.convert(self.mode).to_string(**COLOR_FULL_PREC),
-                    name
+                html.append(
+                    '[{}]({}) {}<br>'.format(
+                        ch_swatch.color_box(
+                            [color.convert(self.gamut_space)], self.default_border,
+                            border_size=BORDER_SIZE, height=self.height, width=self.height * 8,
+                            check_size=check_size
+                        ),
+                        color.convert(self.mode).to_string(**COLOR_FULL_PREC),
+                        name
+                    )
                 )
-            )
-        self.template_vars['channel_names'] = ''.join(html)
+            html = ''.join(html)
+            color_names[key] = html
+            while len(color_names) > COLOR_NAMES_CACHE_SIZE:
+                color_names.popitem(last=False)
+        else:
+            color_names.move_to_end(key)
+        self.template_vars['channel_names'] = html
 
-    def get_hires_color_channel(self, color_filter, mode='undefined'):
-        """Get get a list of all colors within range."""
+    def get_hires_color_channel(self, color_filter, mode='undefined', window=None):
+        """
+        Get get a list of the colors within range.
+
+        Only a window of the range is shown, by default centered on the current value,
+        with buttons to extend the window.
+        """
 
         scale = 1 if mode != 'hsluv' else 100
 
@@ -428,8 +438,7 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         minimum, maximum = ranges[color_filter]
         check_size = self.check_size(self.height)
         html = []
-        color = self.color.clone()
-        current = color.get(color_filter)
+        current = self.color.get(color_filter)
         if color_filter in ('red', 'green', 'blue'):
             estimate = int(cutil.fmt_float(current * 255, 0))
             current = '{}'.format(cutil.fmt_float(current * 255, 5))
@@ -443,36 +452,69 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
             estimate = int(cutil.fmt_float(current, 0))
             current = '{}\xb0'.format(cutil.fmt_float(current, 5))
 
-        for x in range(minimum, maximum + 1):
+        if window is None:
+            start = max(minimum, min(estimate, maximum) - HIRES_WINDOW // 2)
+            end = min(maximum, start + HIRES_WINDOW - 1)
+            start = max(minimum, end - HIRES_WINDOW + 1)
+        else:
+            start = max(minimum, window[0])
+            end = min(maximum, window[1])
+
+        if start > minimum:
+            html.append(
+                '<a class="small button" href="__hirespick__:{}:{}:{}">&#9650; More</a><br>'.format(
+                    color_filter, max(minimum, start - HIRES_WINDOW), end
+                )
+            )
+
+        # Calculate all the colors in the window up front, then convert and render them together.
+        attr = channel_attr(Color, self.color.space(), color_filter)
+        color = ColorValue.from_color(self.color)
+        colors = []
+        labels = []
+        for x in range(start, end + 1):
             if x == estimate:
                 label = '{} <'
             else:
                 label = '{}'
             if color_filter in ('red', 'green', 'blue'):
-                color.set(color_filter, x / 255.0)
+                setattr(color, attr, x / 255.0)
                 label = label.format(str(x))
             elif color_filter == 'alpha':
                 color.alpha = x / 100.0
                 label = label.format("{:d}%".format(x))
             elif color_filter == 'hue':
-                color.hue = x
+                setattr(color, attr, float(x))
                 label = label.format("{:d}\xb0".format(x))
             elif color_filter in ('saturation', 'lightness', 'whiteness', 'blackness', 'value'):
-                color.set(color_filter, x / (100 / scale))
+                setattr(color, attr, x / (100 / scale))
                 label = label.format("{:d}%".format(x))
 
+            colors.append(color.clone())
+            labels.append(label)
+
+        for color, value, label in zip(colors, convert_values(Color, colors, self.gamut_space), labels):
+            if not show_alpha:
+                value.alpha = 1
             html.append(
                 '[{}]({}) {}<br>'.format(
-                    colorbox.color_box(
-                        [color.convert(self.gamut_space).set('alpha', lambda x: x if show_alpha else 1)],
+                    ch_swatch.color_box(
+                        [value.to_color(Color)],
                         self.default_border,
                         border_size=BORDER_SIZE, height=self.height, width=self.height * 8,
                         check_size=check_size
                     ),
-                    color.to_string(**COLOR_FULL_PREC),
+                    color.to_color(Color).to_string(**COLOR_FULL_PREC),
                     label
                 )
             )
+
+        if end < maximum:
+            html.append(
+                '<a class="small button" href="__hirespick__:{}:{}:{}">&#9660; More</a><br>'.format(
+                    color_filter, start, min(maximum, end + HIRES_WINDOW)
+                )
+            )
         self.template_vars['hires_color'] = '{} ({})'.format(color_filter, current)
         self.template_vars['channel_hires'] = ''.join(html)
 
@@ -480,113 +522,86 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         """Get color channel."""
 
         scale = 1 if mode != 'hsluv' else 100
-
-        html = []
-        html.append(
-            '<span class="channel"><a class="small button" href="__hirespick__:{}">{}:</a> '.format(
-                color_filter, label
-            )
-        )
-        temp = []
-        count = 10
         check_size = self.check_size(self.height)
-        clone = self.color.clone()
         show_alpha = color_filter == 'alpha'
+        attr = channel_attr(Color, self.color.space(), color_filter)
+        color = ColorValue.from_color(self.color)
 
-        coord = alg.no_nan(getattr(clone, color_filter))
+        coord = alg.no_nan(getattr(color, attr))
         if color_filter != 'hue':
             rounded = alg.round_half_up(coord, 2 if mode != 'hsluv' else 0)
-            setattr(clone, color_filter, rounded)
             step = 0.01 * scale
+            limit = 1 * scale
         else:
             rounded = alg.round_half_up(coord / 359, 2) * 359
-            setattr(clone, color_filter, rounded)
             step = 3.59
-
-        first = True
-        while count:
-            coord = alg.no_nan(getattr(clone, color_filter)) - step
-            setattr(clone, color_filter, coord)
-
-            if color_filter != "hue" and (coord < 0 or coord > (1 * scale)):
-                temp.append(self.get_spacer(width=count))
-                break
-            elif color_filter == "hue" and (coord < 0 or coord > 359):
-                temp.append(self.get_spacer(width=count))
-                break
-            else:
-                border_map = colorbox.TOP | colorbox.BOTTOM | colorbox.LEFT
-                if first:
-                    border_map |= colorbox.RIGHT
-                    first = False
-
-                kwargs = {
-                    "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size,
-                    "border_map": border_map
-                }
-
-                temp.append(
-                    '<a href="{}" title="{}">{}</a>'.format(
-                        clone.to_string(**COLOR_FULL_PREC),
-                        clone.to_string(),
-                        colorbox.color_box(
-                            [clone.convert(self.gamut_space).set('alpha', lambda x: x if show_alpha else 1)],
-                            self.default_border,
-                            **kwargs
-                        )
-                    )
+            limit = 359
+
+        # Step the channel down and up from the current value, then convert all of the colors together.
+        steps = []
+        for direction in (-step, step):
+            colors = []
+            clone = color.clone()
+            setattr(clone, attr, rounded)
+            while len(colors) < 10:
+                coord = alg.no_nan(getattr(clone, attr)) + direction
+                if coord < 0 or coord > limit:
+                    break
+                setattr(clone, attr, coord)
+                colors.append(clone.clone())
+            steps.append(colors)
+        below, above = steps
+        values = convert_values(Color, below + [color] + above, self.gamut_space)
+        for value in values:
+            if not show_alpha:
+                value.alpha = 1
+
+        def swatch(color, value, border_map):
+            """Get a step's swatch."""
+
+            color = color.to_color(Color)
+            return '<a href="{}" title="{}">{}</a>'.format(
+                color.to_string(**COLOR_FULL_PREC),
+                color.to_string(),
+                ch_swatch.color_box(
+                    [value.to_color(Color)],
+                    self.default_border,
+                    border_size=BORDER_SIZE, height=self.height, width=self.width, check_size=check_size,
+                    border_map=border_map
                 )
-            count -= 1
-        html += reversed(temp)
+            )
+
+        html = []
+        html.append(
+            '<span class="channel"><a class="small button" href="__hirespick__:{}">{}:</a> '.format(
+                color_filter, label
+            )
+        )
+        if len(below) < 10:
+            html.append(self.get_spacer(width=10 - len(below)))
+        for i in reversed(range(len(below))):
+            border_map = colorbox.TOP | colorbox.BOTTOM | colorbox.LEFT
+            if i == 0:
+                border_map |= colorbox.RIGHT
+            html.append(swatch(below[i], values[i], border_map))
         html.append(
             '<a href="{}" title="{}">{}</a>'.format(
                 self.color.to_string(**COLOR_FULL_PREC),
-                clone.to_string(),
-                colorbox.color_box(
-                    [self.color.convert(self.gamut_space).set('alpha', lambda x: x if show_alpha else 1)],
+                self.color.to_string(),
+                ch_swatch.color_box(
+                    [values[len(below)].to_color(Color)],
                     self.default_border,
                     border_size=BORDER_SIZE, height=self.height_big, width=self.width, check_size=check_size
                 )
             )
         )
-        first = True
-        count = 10
-
-        clone.update(self.color)
-        setattr(clone, color_filter, rounded)
-        while count:
-            coord = alg.no_nan(getattr(clone, color_filter)) + step
-            setattr(clone, color_filter, coord)
-
-            if color_filter != "hue" and (coord < 0 or coord > (1 * scale)):
-                html.append(self.get_spacer(width=count))
-                break
-            elif color_filter == "hue" and (coord < 0 or coord > 359):
-                html.append(self.get_spacer(width=count))
-                break
-            else:
-                border_map = colorbox.TOP | colorbox.BOTTOM | colorbox.RIGHT
-                if first:
-                    border_map |= colorbox.LEFT
-                    first = False
-
-                kwargs = {
-                    "border_size": BORDER_SIZE, "height": self.height, "width": self.width, "check_size": check_size,
-                    "border_map": border_map
-                }
-
-                html.append(
-                    '<a href="{}" title="{}">{}</a>'.format(
-                        clone.to_string(**COLOR_FULL_PREC),
-                        clone.to_string(),
-                        colorbox.color_box(
-                            [clone.convert(self.gamut_space).set('alpha', lambda x: x if show_alpha else 1)],
-                            self.default_border,
-                            **kwargs
-                        )
-                    )
-                )
-            count -= 1
+        for i, value in enumerate(values[len(below) + 1:]):
+            border_map = colorbox.TOP | colorbox.BOTTOM | colorbox.RIGHT
+            if i == 0:
+                border_map |= colorbox.LEFT
+            html.append(swatch(above[i], value, border_map))
+        if len(above) < 10:
+            html.append(self.get_spacer(width=10 - len(above)))
         html.append('</span><br>')
         self.template_vars[channel] = ''.join(html)
 
@@ -615,6 +630,7 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
         """Handle HREF."""
 
         hires = None
+        hires_window = None
         colornames = False
         mode = self.mode
         tool = None
@@ -632,7 +648,10 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
             color = href.split(':')[1]
         elif href.startswith('__hirespick__'):
             # We need to open a high resolution channel picker
-            hires = href.split(':')[1]
+            parts = href.split(':')
+            hires = parts[1]
+            if len(parts) == 4:
+                hires_window = [int(parts[2]), int(parts[3])]
             color = self.color.to_string(**COLOR_FULL_PREC)
         elif href.startswith('__tools__'):
             color = self.color.to_string(**COLOR_FULL_PREC)
@@ -727,14 +746,15 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
                 'color_helper_picker',
                 {
                     "color": color,
-                    "mode": mode, "hirespick": hires, "colornames": colornames, "controls": controls,
+                    "mode": mode, "hirespick": hires, "hireswindow": hires_window, "colornames": colornames,
+                    "controls": controls,
                     "on_done": self.on_done, "on_cancel": self.on_cancel
                 }
             )
 
     def run(
-        self, edit, color='#ffffff', mode=None, hirespick=None, colornames=False, controls="box",
-        on_done=None, on_cancel=None, **kwargs
+        self, edit, color='#ffffff', mode=None, hirespick=None, hireswindow=None, colornames=False,
+        controls="box", on_done=None, on_cancel=None, **kwargs
     ):
         """Run command."""
 
@@ -753,7 +773,7 @@ class ColorHelperPickerCommand(_ColorMixin, sublime_plugin.TextCommand):
             # Show high resolution channel picker
             self.template_vars['hires'] = True
             self.template_vars['cancel'] = self.color.to_string(**COLOR_FULL_PREC)
-            self.get_hires_color_channel(hirespick, mode=self.mode)
+            self.get_hires_color_channel(hirespick, mode=self.mode, window=hireswindow)
         else:
             template = 'Packages/ColorHelper/panels/color-picker.html.j2'
             # Show the normal color picker of the specified space
@@ -8,15 +8,18 @@ import sublime
 import sublime_plugin
 from .lib.coloraide import Color
 import threading
-from time import time, sleep
+import bisect
+from time import time, perf_counter
 import re
 import os
 import mdpopups
-from .lib import colorbox
 from . import ch_util as util
+from . import ch_swatch
+from . import ch_picker
 import traceback
 from .lib.multiconf import get as qualify_settings
-from collections import namedtuple
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor
 
 PREVIEW_IMG = (
     '<style>'
@@ -27,13 +30,38 @@ PREVIEW_IMG = (
 
 PREVIEW_BORDER_SIZE = 1
 
+# Commands that scroll the view.
+SCROLL_COMMANDS = frozenset(
+    (
+        'scroll_lines', 'show_at_center', 'move_to', 'move', 'goto_line',
+        'fold', 'unfold', 'fold_by_level', 'unfold_all', 'fold_tag_attributes'
+    )
+)
+
+# Number of threads used to render previews.
+RENDER_WORKERS = 2
+
+# Number of characters scanned at a time when indexing the buffer in the background.
+INDEX_CHUNK_SIZE = 16384
+
+# Shortest time in milliseconds between checks of the viewport for scrolling.
+MIN_SCROLL_WAIT_TIME = 50
+
+# Text change tracking is only available on newer Sublime builds.
+# Without it, any modification requires a full rescan of the viewport.
+TRACK_TEXT_CHANGES = hasattr(sublime_plugin, 'TextChangeListener')
+
 reload_flag = False
 ch_last_updated = None
 ch_settings = None
 unloading = False
+ch_previews = {}
 
-if 'ch_preview_thread' not in globals():
-    ch_preview_thread = None
+if 'ch_preview_scheduler' not in globals():
+    ch_preview_scheduler = None
+
+if 'ch_render_pool' not in globals():
+    ch_render_pool = None
 
 
 def preview_is_on_left():
@@ -41,10 +69,656 @@ def preview_is_on_left():
     return ch_settings.get('inline_preview_position') != 'right'
 
 
-class ColorSwatch(namedtuple('ColorSwatch', ['start', 'end', 'pid', 'uid'])):
+def get_preview_index(buffer_id):
+    """Get the preview index for the given buffer, creating it if needed."""
+
+    index = ch_previews.get(buffer_id)
+    if index is None:
+        index = PreviewIndex()
+        ch_previews[buffer_id] = index
+    return index
+
+
+class PreviewStats:
+    """
+    Timings and counters for a buffer's previews.
+
+    Timings are recorded per phase, keeping only the most recent samples.
+    """
+
+    PHASES = (
+        ('scan', 'Scan (total)'),
+        ('source_iter', 'Visible source'),
+        ('trigger', 'Trigger regex'),
+        ('scope', 'Scope scoring'),
+        ('match', 'Color match'),
+        ('render', 'Render (total)'),
+        ('fit', 'Gamut fitting (batch)'),
+        ('color_box', 'Swatch image'),
+        ('phantoms', 'Phantom update')
+    )
+
+    # Number of samples kept per phase.
+    SAMPLES = 500
+
+    def __init__(self):
+        """Initialize."""
+
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counters = {}
+
+    def add(self, phase, seconds):
+        """Record the time a phase took."""
+
+        with self.lock:
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = deque(maxlen=self.SAMPLES)
+                self.samples[phase] = samples
+            samples.append(seconds)
+
+    def count(self, name, value=1):
+        """Increment a counter."""
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def percentile(self, phase, percent):
+        """Get the given percentile of the samples recorded for a phase."""
+
+        with self.lock:
+            samples = sorted(self.samples.get(phase, []))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def report(self):
+        """Get a report of the stats."""
+
+        with self.lock:
+            counters = self.counters.copy()
+
+        lines = ['{:<20}{:>10}{:>12}{:>12}'.format('Phase', 'Samples', 'p50 (ms)', 'p95 (ms)')]
+        for phase, label in self.PHASES:
+            p50 = self.percentile(phase, 50)
+            if p50 is None:
+                continue
+            lines.append(
+                '{:<20}{:>10}{:>12.3f}{:>12.3f}'.format(
+                    label, len(self.samples[phase]), p50 * 1000, self.percentile(phase, 95) * 1000
+                )
+            )
+
+        lines.append('')
+        scan_time = counters.get('scan_time', 0)
+        colors = counters.get('colors', 0)
+        lines.append('Colors scanned:      {}'.format(colors))
+        lines.append('Characters scanned:  {}'.format(counters.get('chars', 0)))
+        lines.append('Colors per second:   {:.0f}'.format(colors / scan_time if scan_time else 0))
+        lines.append('Phantoms created:    {}'.format(counters.get('phantoms', 0)))
+        lines.append('Renders cancelled:   {}'.format(counters.get('cancelled', 0)))
+        hits = counters.get('scope_hits', 0)
+        total = hits + counters.get('scope_misses', 0)
+        lines.append('Scope cache hits:    {:.1%} of {}'.format(hits / total if total else 0, total))
+        return '\n'.join(lines)
+
+
+class ColorSwatch(namedtuple('ColorSwatch', ['start', 'end', 'phantom', 'uid'])):
     """Color swatch."""
 
 
+class ColorEntry(namedtuple('ColorEntry', ['start', 'end', 'color', 'color_class'])):
+    """Color found in a buffer."""
+
+
+class PreviewIndex:
+    """
+    Index of the colors found in a buffer and the color previews currently shown.
+
+    Colors are kept sorted by their start point along with the ranges of the buffer
+    that have been scanned, so the colors in any range can be looked up without scanning it again.
+
+    Text changes are recorded as they happen: colors and swatches after a change are shifted,
+    swatches touched by a change are dropped, and the changed text is recorded
+    as dirty so that only the affected lines need to be rescanned.
+
+    The previews are shown through a single phantom set, so each update only adds and erases
+    the phantoms that actually changed.
+    """
+
+    # If a buffer collects more dirty regions than this between scans, just rescan everything.
+    MAX_DIRTY = 100
+
+    def __init__(self):
+        """Initialize."""
+
+        self.lock = threading.Lock()
+        self.version = 0
+        self.generation = 0
+        self.phantom_set = None
+        self.batch = None
+        self.stats = PreviewStats()
+        self.swatches = {}
+        self.dirty = []
+        self.full = False
+        self.starts = []
+        self.colors = []
+        self.scanned = []
+
+    def clear(self):
+        """Clear the index."""
+
+        with self.lock:
+            self.version += 1
+            self.generation += 1
+            self.swatches = {}
+            self.dirty = []
+            self.full = False
+            self.starts = []
+            self.colors = []
+            self.scanned = []
+
+    def reset(self):
+        """Clear the index, but return the swatches so that the phantoms can be reused."""
+
+        swatches = self.swatches
+        self.clear()
+        return swatches
+
+    def cancel_render(self):
+        """Cancel any previews that are still being rendered."""
+
+        batch = self.batch
+        self.batch = None
+        if batch is not None:
+            batch.cancel()
+            self.stats.count('cancelled')
+
+    def update_phantoms(self, view, swatches, version=None):
+        """
+        Add the given swatches and update the view to show exactly the phantoms of the current swatches.
+
+        If a version is given, and the buffer has changed since, the swatches are discarded.
+        """
+
+        with self.lock:
+            if version is not None and version != self.version:
+                return False
+            for swatch in swatches:
+                self.swatches[swatch.start] = swatch
+            phantoms = [swatch.phantom for swatch in self.swatches.values()]
+        start = perf_counter()
+        if self.phantom_set is None or self.phantom_set.view != view:
+            self.phantom_set = sublime.PhantomSet(view, 'color_helper')
+        self.phantom_set.update(phantoms)
+        self.stats.add('phantoms', perf_counter() - start)
+        self.stats.count('phantoms', len(swatches))
+        return True
+
+    def exists(self, start):
+        """Check if a swatch exists at the given start point."""
+
+        return start in self.swatches
+
+    def find(self, uid):
+        """Find the swatch with the given unique ID."""
+
+        with self.lock:
+            for swatch in self.swatches.values():
+                if swatch.uid == uid:
+                    return swatch
+        return None
+
+    def colors_in(self, begin, end):
+        """Get the colors that start within the given range."""
+
+        with self.lock:
+            return self.colors[bisect.bisect_left(self.starts, begin):bisect.bisect_left(self.starts, end)]
+
+    def gaps(self, begin, end):
+        """Get the ranges between `begin` and `end` that have not been scanned."""
+
+        gaps = []
+        with self.lock:
+            for a, b in self.scanned:
+                if b <= begin:
+                    continue
+                if a >= end:
+                    break
+                if a > begin:
+                    gaps.append((begin, a))
+                begin = b
+        if begin < end:
+            gaps.append((begin, end))
+        return gaps
+
+    def update(self, begin, end, colors, version):
+        """
+        Store the colors found when scanning the range between `begin` and `end`.
+
+        If the buffer has changed since the scan started, the colors are discarded.
+        """
+
+        with self.lock:
+            if version != self.version:
+                return False
+
+            i = bisect.bisect_left(self.starts, begin)
+            j = bisect.bisect_left(self.starts, end)
+            self.starts[i:j] = [c.start for c in colors]
+            self.colors[i:j] = colors
+            self._mark_scanned(begin, end)
+        return True
+
+    def invalidate(self, region):
+        """
+        Forget everything that is known about the given region.
+
+        The region will need to be scanned again, and all swatches that intersect it are removed and returned.
+        """
+
+        begin = region.begin()
+        end = region.end()
+        removed = []
+        with self.lock:
+            self.version += 1
+
+            for start, swatch in list(self.swatches.items()):
+                if swatch.end >= begin and swatch.start <= end:
+                    removed.append(swatch)
+                    del self.swatches[start]
+
+            keep = [c for c in self.colors if c.end < begin or c.start > end]
+            self.colors = keep
+            self.starts = [c.start for c in keep]
+
+            scanned = []
+            for a, b in self.scanned:
+                if b <= begin or a >= end:
+                    scanned.append((a, b))
+                    continue
+                if a < begin:
+                    scanned.append((a, begin))
+                if b > end:
+                    scanned.append((end, b))
+            self.scanned = scanned
+        return removed
+
+    def _mark_scanned(self, begin, end):
+        """Mark the given range as scanned and merge it with any adjacent scanned ranges."""
+
+        scanned = []
+        for a, b in self.scanned:
+            if b < begin or a > end:
+                scanned.append((a, b))
+            else:
+                begin = min(a, begin)
+                end = max(b, end)
+        scanned.append((begin, end))
+        scanned.sort()
+        self.scanned = scanned
+
+    def text_changed(self, begin, end, size):
+        """
+        Track a text change that replaced the content between `begin` and `end` with `size` characters.
+
+        All points are relative to the buffer before the change, and everything recorded
+        is updated to be relative to the buffer after the change.
+        """
+
+        delta = size - (end - begin)
+
+        def shift(pt):
+            """Shift a point so that it is relative to the buffer after the change."""
+
+            if pt <= begin:
+                return pt
+            if pt >= end:
+                return pt + delta
+            return begin + size
+
+        with self.lock:
+            self.version += 1
+
+            # Shift swatches that come after the change and drop any that were touched.
+            swatches = {}
+            for swatch in self.swatches.values():
+                if swatch.end < begin:
+                    swatches[swatch.start] = swatch
+                elif swatch.start > end:
+                    shifted = swatch._replace(start=swatch.start + delta, end=swatch.end + delta)
+                    swatches[shifted.start] = shifted
+            self.swatches = swatches
+
+            # Shift colors that come after the change and drop any that were touched.
+            # The dirty lines will be scanned again.
+            i = bisect.bisect_right(self.starts, end)
+            colors = [c for c in self.colors[:i] if c.end < begin]
+            if delta:
+                colors.extend(
+                    ColorEntry(a + delta, b + delta, color, color_class)
+                    for a, b, color, color_class in self.colors[i:]
+                )
+            else:
+                colors.extend(self.colors[i:])
+            self.colors = colors
+            self.starts = [c.start for c in colors]
+            self.scanned = [(shift(a), shift(b)) for a, b in self.scanned if shift(b) > shift(a)]
+
+            if self.full:
+                return
+
+            # Update the dirty regions and merge any that overlap the change.
+            dirty_begin = begin
+            dirty_end = begin + size
+            dirty = []
+            for a, b in self.dirty:
+                if b < begin:
+                    dirty.append((a, b))
+                elif a > end:
+                    dirty.append((a + delta, b + delta))
+                else:
+                    dirty_begin = min(a, dirty_begin)
+                    dirty_end = max(b + delta if b > end else dirty_end, dirty_end)
+            dirty.append((dirty_begin, dirty_end))
+            self.dirty = dirty
+
+            if len(self.dirty) > self.MAX_DIRTY:
+                self.full = True
+                self.dirty = []
+
+    def pop_changes(self):
+        """Return and reset the recorded changes: whether everything is dirty and the dirty regions."""
+
+        with self.lock:
+            changes = (self.full, sorted(self.dirty))
+            self.full = False
+            self.dirty = []
+        return changes
+
+
+class ColorScanner:
+    """Find colors in a view using the view's scan rules."""
+
+    # Text read around a scanned range so that lookbehinds work at its start,
+    # and colors that start within the range, but end past it, are still found.
+    CONTEXT = 64
+    LOOKAHEAD = 1024
+
+    def __init__(self, view, rules, color_classes, stats):
+        """Initialize."""
+
+        self.view = view
+        self.stats = stats
+        self.scope_misses = 0
+        self.scanning = rules.get("scanning")
+        self.classes = rules.get("color_class", "css-level-4")
+        self.color_trigger = re.compile(rules.get("color_trigger", util.RE_COLOR_START))
+        self.color_classes = color_classes
+        self.scopes = {}
+
+    def get_color_class(self, scope):
+        """Get color class based on selection scope."""
+
+        # Check if the first point within the color matches our scope rules
+        # and load up the appropriate color class
+        color_class = None
+        filters = []
+        for item in self.classes:
+            try:
+                value = sublime.score_selector(scope, item["scopes"])
+                if not value:
+                    continue
+                else:
+                    class_options = self.color_classes.get(item["class"])
+                    if class_options is None:
+                        continue
+                    module = class_options.get("class", "ColorHelper.lib.coloraide.Color")
+                    if isinstance(module, str):
+                        # Initialize the color module and cache it for this view
+                        color_class = util.import_color(module)
+                        class_options["class"] = color_class
+                    else:
+                        color_class = module
+                    filters = class_options.get("filters", [])
+                    break
+            except Exception:
+                pass
+        return color_class, filters
+
+    def get_scope_info(self, pt):
+        """
+        Get the color class, filters, and whether scanning is allowed at the given point.
+
+        The results only depend on the scope, and the same scopes repeat a lot,
+        so they are cached by scope name.
+        """
+
+        scope = self.view.scope_name(pt)
+        info = self.scopes.get(scope)
+        if info is None:
+            self.scope_misses += 1
+            color_class, filters = self.get_color_class(scope)
+            try:
+                allowed = bool(sublime.score_selector(scope, self.scanning))
+            except Exception:
+                allowed = False
+            info = (color_class, filters, allowed)
+            self.scopes[scope] = info
+        return info
+
+    def scan(self, begin, end):
+        """Find all the colors that start between `begin` and `end`."""
+
+        scan_start = perf_counter()
+        scope_time = 0.0
+        match_time = 0.0
+        lookups = 0
+        misses = self.scope_misses
+
+        offset = max(0, begin - self.CONTEXT)
+        source = self.view.substr(sublime.Region(offset, min(self.view.size(), end + self.LOOKAHEAD)))
+        limit = end - offset
+
+        colors = []
+        for m in self.color_trigger.finditer(source, begin - offset):
+            # Test if we have found a valid color
+            start = m.start()
+            if start >= limit:
+                break
+            src_start = offset + start
+
+            # Check if the first point within the color matches our scope rules
+            # and load up the appropriate color class, and check if scope matches for scanning.
+            lookups += 1
+            t = perf_counter()
+            color_class, filters, allowed = self.get_scope_info(src_start)
+            scope_time += perf_counter() - t
+            if color_class is None or not allowed:
+                continue
+
+            t = perf_counter()
+            obj = color_class.match(source, start=start, filters=filters)
+            match_time += perf_counter() - t
+            if obj is not None:
+                colors.append(ColorEntry(src_start, offset + obj.end, obj.color, color_class))
+
+        # Whatever time wasn't spent on scopes and matching was spent reading the source and finding triggers.
+        elapsed = perf_counter() - scan_start
+        self.stats.add('scan', elapsed)
+        self.stats.add('trigger', elapsed - scope_time - match_time)
+        self.stats.add('scope', scope_time)
+        self.stats.add('match', match_time)
+        self.stats.count('scan_time', elapsed)
+        self.stats.count('chars', end - begin)
+        self.stats.count('colors', len(colors))
+        misses = self.scope_misses - misses
+        self.stats.count('scope_hits', lookups - misses)
+        self.stats.count('scope_misses', misses)
+        return colors
+
+    def index(self, index, begin, end):
+        """Scan the range between `begin` and `end` and store the colors found in the index."""
+
+        version = index.version
+        return index.update(begin, end, self.scan(begin, end), version)
+
+
+def fill_index(view, scanner, generation):
+    """
+    Scan the rest of the buffer for colors in the background, one chunk at a time.
+
+    The chunks are scanned on the async thread so that other work can interleave.
+    A newer scan of the buffer supersedes this one.
+    """
+
+    if unloading or not view.is_valid():
+        return
+    index = ch_previews.get(view.buffer_id())
+    if index is None or index.generation != generation:
+        return
+
+    gaps = index.gaps(0, view.size())
+    if not gaps:
+        return
+    begin, end = gaps[0]
+    end = min(end, begin + INDEX_CHUNK_SIZE)
+    scanner.index(index, begin, end)
+    sublime.set_timeout_async(lambda: fill_index(view, scanner, generation), 0)
+
+
+class RenderJob(namedtuple('RenderJob', ['start', 'end', 'pt', 'color', 'border', 'uid'])):
+    """Preview to render."""
+
+
+class RenderOptions(
+    namedtuple(
+        'RenderOptions',
+        [
+            'style', 'box_height', 'check_size'
+        ]
+    )
+):
+    """Options for rendering previews."""
+
+
+def render_preview(job, preview, options, stats=None):
+    """Render the preview for a color and return its HTML."""
+
+    start = perf_counter()
+    html = PREVIEW_IMG.format(
+        job.uid,
+        ' title="Preview out of gamut"' if preview.message else '',
+        ch_swatch.preview_box(
+            preview,
+            height=options.box_height, width=options.box_height,
+            border_size=PREVIEW_BORDER_SIZE, check_size=options.check_size,
+            gamut_space=options.style.gamut_space
+        )
+    )
+
+    if stats is not None:
+        stats.add('color_box', perf_counter() - start)
+    return html
+
+
+class RenderBatch:
+    """
+    Render a batch of previews on the worker pool.
+
+    The jobs are split across the workers, and once all of them are done,
+    `done` is called with the batch on the async thread so the previews can be added all at once.
+    A cancelled batch never calls `done`.
+    """
+
+    def __init__(self, jobs, options, on_navigate, version, done, stats=None):
+        """Initialize."""
+
+        self.lock = threading.Lock()
+        self.stats = stats
+        self.jobs = jobs
+        self.options = options
+        self.on_navigate = on_navigate
+        self.version = version
+        self.done = done
+        self.cancelled = False
+        self.futures = []
+        self.remaining = 0
+        self.swatches = []
+
+    def start(self, pool):
+        """Submit the jobs to the pool."""
+
+        count = min(RENDER_WORKERS, len(self.jobs))
+        self.remaining = count
+        for i in range(count):
+            future = pool.submit(self.render, self.jobs[i::count])
+            self.futures.append(future)
+        for future in self.futures:
+            future.add_done_callback(self.finished)
+
+    def cancel(self):
+        """Cancel the batch."""
+
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+
+    def render(self, jobs):
+        """Render the given jobs."""
+
+        # Fit the colors for all the jobs together so repeated colors are only fitted once.
+        start = perf_counter()
+        try:
+            previews = ch_swatch.get_previews(
+                [Color(job.color) for job in jobs], self.options.style, [job.border for job in jobs]
+            )
+        except Exception:
+            # Fit the colors one at a time so that only the jobs that fail are skipped.
+            util.debug('ColorHelper: \n' + str(traceback.format_exc()))
+            previews = []
+            for job in jobs:
+                try:
+                    previews.append(
+                        ch_swatch.get_previews([Color(job.color)], self.options.style, [job.border])[0]
+                    )
+                except Exception:
+                    util.debug('ColorHelper: \n' + str(traceback.format_exc()))
+                    previews.append(None)
+        if self.stats is not None:
+            self.stats.add('fit', perf_counter() - start)
+
+        swatches = []
+        for job, preview in zip(jobs, previews):
+            if self.cancelled or unloading:
+                break
+            if preview is None:
+                continue
+            start = perf_counter()
+            try:
+                html = render_preview(job, preview, self.options, self.stats)
+            except Exception:
+                util.debug('ColorHelper: \n' + str(traceback.format_exc()))
+                continue
+            phantom = sublime.Phantom(sublime.Region(job.pt), html, sublime.LAYOUT_INLINE, on_navigate=self.on_navigate)
+            swatches.append(ColorSwatch(job.start, job.end, phantom, job.uid))
+            if self.stats is not None:
+                self.stats.add('render', perf_counter() - start)
+        return swatches
+
+    def finished(self, future):
+        """Collect the results and finish the batch once all the jobs are done."""
+
+        with self.lock:
+            if not future.cancelled() and future.exception() is None:
+                self.swatches.extend(future.result())
+            self.remaining -= 1
+            last = self.remaining == 0
+        if last and not self.cancelled:
+            sublime.set_timeout_async(lambda: self.done(self), 0)
+
+
 class Extent(namedtuple('Extent', ['start', 'end'])):
     """Range of dimension."""
 
@@ -53,6 +727,17 @@ class Dimensions(namedtuple('Dimensions', ['x', 'y'])):
     """Dimensions."""
 
 
+def get_viewport_bounds(view):
+    """Get the viewable bounds of the view."""
+
+    position = view.viewport_position()
+    dimensions = view.viewport_extent()
+    return Dimensions(
+        Extent(position[0], position[0] + dimensions[0] - 1),
+        Extent(position[1], position[1] + dimensions[1] - 1)
+    )
+
+
 class ColorHelperPreviewOverrideCommand(sublime_plugin.TextCommand):
     """Override current scanning state."""
 
@@ -77,8 +762,7 @@ class ColorHelperPreviewOverrideCommand(sublime_plugin.TextCommand):
             self.view.settings().set("color_helper.scan_override", option)
             if option == "Force enable":
                 self.view.settings().set("color_helper.scan_override", option)
-                ch_preview_thread.modified = True
-                ch_preview_thread.time = time()
+                ch_preview_scheduler.request(modified=True)
             elif option == "Force disable":
                 self.view.settings().set("color_helper.scan_override", option)
                 self.view.window().run_command("color_helper_preview", {"clear": True})
@@ -87,6 +771,48 @@ class ColorHelperPreviewOverrideCommand(sublime_plugin.TextCommand):
                 self.view.window().run_command("color_helper_preview", {"clear": True})
 
 
+class ColorHelperPreviewStatsCommand(sublime_plugin.WindowCommand):
+    """Show preview timings and counters for the current view."""
+
+    def run(self):
+        """Write the stats for the current view into a new view."""
+
+        view = self.window.active_view()
+        if view is None:
+            return
+
+        lines = ['Preview stats for: {}'.format(view.file_name() or view.name() or 'untitled'), '']
+        lines.append(get_preview_index(view.buffer_id()).stats.report())
+
+        info = ch_swatch.cache_info()
+        total = info.hits + info.misses
+        lines.append('Swatch cache hits:   {:.1%} of {} ({}/{} cached)'.format(
+            info.hits / total if total else 0, total, info.size, info.maxsize
+        ))
+        fit_cache = ch_swatch.fit_cache
+        total = fit_cache.hits + fit_cache.misses
+        lines.append('Fit cache hits:      {:.1%} of {} ({}/{} cached)'.format(
+            fit_cache.hits / total if total else 0, total, len(fit_cache), fit_cache.size
+        ))
+
+        if ch_preview_scheduler is not None:
+            counters = ch_preview_scheduler.counters()
+            lines.append('')
+            lines.append('Scheduler requests:  {}'.format(counters['requested']))
+            lines.append('Coalesced:           {}'.format(counters['coalesced']))
+            lines.append('Updates executed:    {}'.format(counters['executed']))
+            lines.append('Scroll checks:       {}'.format(counters['scroll_checks']))
+            lines.append('Last update latency: {:.1f} ms'.format(counters['latency'] * 1000))
+
+        stats_view = self.window.new_file()
+        stats_view.set_name('ColorHelper - Preview Stats')
+        stats_view.settings().set('gutter', False)
+        stats_view.settings().set('word_wrap', False)
+        stats_view.run_command('append', {"characters": '\n'.join(lines) + '\n'})
+        stats_view.set_read_only(True)
+        stats_view.set_scratch(True)
+
+
 class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
     """Color Helper preview with phantoms."""
 
@@ -95,25 +821,24 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
 
         super().__init__(window)
         self.previous_region = {}
-        self.previews = {}
         self.color_classes = {}
         for view in window.views():
             view.erase_phantoms("color_helper")
+            ch_previews.pop(view.buffer_id(), None)
 
     def on_navigate(self, href):
         """Handle color box click."""
 
         self.view.sel().clear()
-        for k, v in self.previews[self.view.buffer_id()].items():
-            if href == v.uid:
-                phantom = self.view.query_phantom(v.pid)
-                if phantom:
-                    self.view.sel().add(sublime.Region(int(v.end), int(v.start)))
-                    sublime.set_timeout(
-                        lambda cmd="color_helper", args={"mode": "info"}: self.view.run_command(cmd, args),
-                        100
-                    )
-                break
+        v = get_preview_index(self.view.buffer_id()).find(href)
+        if v is not None:
+            phantom = self.view.query_phantom(v.phantom.id)
+            if phantom:
+                self.view.sel().add(sublime.Region(int(v.end), int(v.start)))
+                sublime.set_timeout(
+                    lambda cmd="color_helper", args={"mode": "info"}: self.view.run_command(cmd, args),
+                    100
+                )
 
     def calculate_box_size(self):
         """Calculate the preview box size."""
@@ -229,40 +954,15 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
         if last_start is not None:
             yield sublime.Region(last_start, last_end)
 
-    def get_color_class(self, pt, classes):
-        """Get color class based on selection scope."""
+    def get_color_classes(self):
+        """Get the color classes for the view."""
 
         view_id = self.view.buffer_id()
         if not self.color_classes[view_id] or self.view.settings().get('color_helper.refresh', True):
             util.debug("Clear color class stash")
             self.view.settings().set('color_helper.refresh', False)
             self.color_classes[view_id] = util.get_settings_colors()
-
-        # Check if the first point within the color matches our scope rules
-        # and load up the appropriate color class
-        color_class = None
-        filters = []
-        for item in classes:
-            try:
-                value = self.view.score_selector(pt, item["scopes"])
-                if not value:
-                    continue
-                else:
-                    class_options = self.color_classes[view_id].get(item["class"])
-                    if class_options is None:
-                        continue
-                    module = class_options.get("class", "ColorHelper.lib.coloraide.Color")
-                    if isinstance(module, str):
-                        # Initialize the color module and cache it for this view
-                        color_class = util.import_color(module)
-                        class_options["class"] = color_class
-                    else:
-                        color_class = module
-                    filters = class_options.get("filters", [])
-                    break
-            except Exception:
-                pass
-        return color_class, filters
+        return self.color_classes[view_id]
 
     def setup_gamut_options(self):
         """Setup gamut options."""
@@ -271,8 +971,9 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
         self.gamut_space = ch_settings.get('gamut_space', 'srgb')
         if self.gamut_space not in util.GAMUT_SPACES:
             self.gamut_space = 'srgb'
-        self.out_of_gamut = Color("transparent").convert(self.gamut_space)
-        self.out_of_gamut_border = Color(self.view.style().get('redish', "red")).convert(self.gamut_space)
+        self.out_of_gamut, self.out_of_gamut_border = ch_swatch.get_out_of_gamut(
+            self.view.style().get('redish', "red"), self.gamut_space
+        )
 
     def do_search(self, force=False):
         """
@@ -322,28 +1023,47 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
         # we need to reload the boxes.
         old_box_height = int(settings.get('color_helper.box_height', 0))
         current_color_scheme = settings.get('color_scheme')
-        if (
-            force or old_box_height != box_height or
-            current_color_scheme != settings.get('color_helper.color_scheme', '') or
-            settings.get('color_helper.refresh')
-        ):
-            self.erase_phantoms()
+        style_changed = (
+            old_box_height != box_height or
+            current_color_scheme != settings.get('color_helper.color_scheme', '')
+        )
+        index = get_preview_index(view_id)
+
+        # When forced, everything is scanned again, but the existing phantoms are kept until
+        # the new ones are ready, and any that are unchanged are reused.
+        previous = {}
+        if force or style_changed or settings.get('color_helper.refresh'):
+            previous = index.reset()
+            self.reset_previous()
             settings.set('color_helper.color_scheme', current_color_scheme)
             settings.set('color_helper.box_height', box_height)
             force = True
 
         # Get viewable bounds so we can constrain both vertically and horizontally.
         visible_region = self.view.visible_region()
-        position = self.view.viewport_position()
-        dimensions = self.view.viewport_extent()
-        bounds = Dimensions(
-            Extent(position[0], position[0] + dimensions[0] - 1),
-            Extent(position[1], position[1] + dimensions[1] - 1)
-        )
+        bounds = get_viewport_bounds(self.view)
+
+        # Apply any text changes since the last scan. Previews that were touched by an edit are removed,
+        # and only the lines that were edited need to be scanned again.
+        full, dirty = index.pop_changes()
+        if full and not force:
+            previous = index.reset()
+            self.reset_previous()
+            force = True
+        dirty_regions = []
+        if not force:
+            for a, b in dirty:
+                line = self.view.line(sublime.Region(a, b))
+                if dirty_regions and dirty_regions[-1].end() >= line.begin():
+                    line = dirty_regions.pop().cover(line)
+                dirty_regions.append(line)
+            for line in dirty_regions:
+                index.invalidate(line)
 
         # If we don't need to force previews,
         # quit if visible region is the same as last time
-        if not force and self.previous_region[view_id] == bounds:
+        scroll = self.previous_region[view_id] != bounds
+        if not force and not scroll and not dirty_regions:
             return
         self.previous_region[view_id] = bounds
 
@@ -364,134 +1084,107 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
             # Get out of gamut related options
             self.setup_gamut_options()
 
-            # Get triggers that identify where colors are likely
-            color_trigger = re.compile(rules.get("color_trigger", util.RE_COLOR_START))
+            scanner = ColorScanner(self.view, rules, self.get_color_classes(), index.stats)
+            borders = {}
 
             # Find source content in the visible region.
             # We will return consecutive content, but if the lines are too wide
             # horizontally, they will be clipped and returned as separate chunks.
-            for src_region in self.source_iter(visible_region, bounds):
-                source = self.view.substr(src_region)
-                start = 0
-
-                # Find colors in this source chunk.
-                for m in color_trigger.finditer(source):
-                    # Test if we have found a valid color
-                    start = m.start()
-                    src_start = src_region.begin() + start
-
-                    # Check if the first point within the color matches our scope rules
-                    # and load up the appropriate color class
-                    color_class, filters = self.get_color_class(src_start, classes)
-                    if color_class is None:
-                        continue
-
-                    # Check if scope matches for scanning
-                    try:
-                        value = self.view.score_selector(src_start, scanning)
-                        if not value:
-                            continue
-                    except Exception:
-                        continue
-
-                    obj = color_class.match(source, start=start, filters=filters)
-                    if obj is not None:
-                        # Calculate true start and end of the color source
-                        src_end = src_region.begin() + obj.end
-                        region = sublime.Region(src_start, src_end)
-
-                        # If "preview on select" is enabled, only show preview if within a selection
-                        # or if the selection as no width and the color comes right after.
-                        if preview_on_select and not self.is_selected(region, sels):
-                            continue
-                    else:
+            t = perf_counter()
+            chunks = list(self.source_iter(visible_region, bounds))
+            index.stats.add('source_iter', perf_counter() - t)
+            for src_region in chunks:
+                # Scan anything in the chunk that hasn't been indexed yet,
+                # then look up the colors that start within it.
+                for begin, end in index.gaps(src_region.begin(), src_region.end()):
+                    scanner.index(index, begin, end)
+
+                for entry in index.colors_in(src_region.begin(), src_region.end()):
+                    src_start = entry.start
+                    src_end = entry.end
+                    region = sublime.Region(src_start, src_end)
+
+                    # If "preview on select" is enabled, only show preview if within a selection
+                    # or if the selection as no width and the color comes right after.
+                    if preview_on_select and not self.is_selected(region, sels):
                         continue
 
                     # Calculate point at which we which to insert preview
                     position_on_left = preview_is_on_left()
                     pt = src_start if position_on_left else src_end
-                    if str(region.begin()) in self.previews[view_id]:
+                    if index.exists(region.begin()):
                         # Already exists
                         continue
 
-                    # Calculate a reasonable border color for our image at this location and get color strings
-                    hsl = Color(
-                        mdpopups.scope2style(self.view, self.view.scope_name(pt))['background'],
-                        filters=util.CSS_SRGB_SPACES
-                    ).convert("hsl")
-                    hsl.lightness = hsl.lightness + (0.3 if hsl.luminance() < 0.5 else -0.3)
-                    preview_border = hsl.convert(self.gamut_space, fit=True).set('alpha', 1)
-
-                    color = Color(obj.color)
-                    title = ''
-                    if self.gamut_space == 'srgb':
-                        check_space = self.gamut_space if color.space() not in util.SRGB_SPACES else color.space()
-                    else:
-                        check_space = self.gamut_space
-                    if not color.in_gamut(check_space):
-                        title = ' title="Preview out of gamut"'
-                        if self.show_out_of_gamut_preview:
-                            pcolor = color.convert(self.gamut_space, fit=True)
-                            preview1 = pcolor.clone().set('alpha', 1)
-                            preview2 = pcolor
-                        else:
-                            preview1 = self.out_of_gamut
-                            preview2 = self.out_of_gamut
-                            preview_border = self.out_of_gamut_border
-                    else:
-                        pcolor = color.convert(self.gamut_space, fit=True)
-                        preview1 = pcolor.clone().set('alpha', 1)
-                        preview2 = pcolor
-
-                    # Create preview
-                    unique_id = str(time()) + str(region)
-                    html = PREVIEW_IMG.format(
-                        unique_id,
-                        title,
-                        colorbox.color_box(
-                            [preview1, preview2], preview_border,
-                            height=box_height, width=box_height,
-                            border_size=PREVIEW_BORDER_SIZE, check_size=check_size,
-                            gamut_space=self.gamut_space
+                    # Calculate a reasonable border color for our image at this location and get color strings.
+                    # The border only depends on the scope, so only calculate it once per scope.
+                    scope = self.view.scope_name(pt)
+                    preview_border = borders.get(scope)
+                    if preview_border is None:
+                        preview_border = ch_swatch.get_border(
+                            mdpopups.scope2style(self.view, scope)['background'], self.gamut_space
                         )
-                    )
-                    colors.append(
-                        (
-                            html,
-                            pt,
-                            region.begin(),
-                            region.end(),
-                            unique_id
-                        )
-                    )
+                        borders[scope] = preview_border
 
-            # Add all previews
-            self.add_phantoms(colors)
+                    # Reuse the ID of a previous preview for the same color
+                    # so that unchanged previews keep their phantoms.
+                    old = previous.get(src_start)
+                    unique_id = old.uid if old is not None and old.end == src_end else str(time()) + str(region)
+                    colors.append(RenderJob(src_start, src_end, pt, entry.color, preview_border, unique_id))
 
-            # The phantoms may have altered the viewable region,
-            # so set previous region to the current viewable region
-            visible_region = self.view.visible_region()
-            position = self.view.viewport_position()
-            dimensions = self.view.viewport_extent()
-            bounds = Dimensions(
-                Extent(position[0], position[0] + dimensions[0] - 1),
-                Extent(position[1], position[1] + dimensions[1] - 1)
+            # Render the previews on the worker pool, they will be added in one batch once they are all done.
+            style = ch_swatch.SwatchStyle(
+                self.gamut_space, self.show_out_of_gamut_preview, None, self.out_of_gamut, self.out_of_gamut_border
             )
-            self.previous_region[view_id] = bounds
+            options = RenderOptions(style, box_height, check_size)
+            self.render_phantoms(index, colors, options, bounds)
+
+            # Index the rest of the buffer in the background so that scrolling only needs to look colors up.
+            index.generation += 1
+            view = self.view
+            generation = index.generation
+            sublime.set_timeout_async(lambda: fill_index(view, scanner, generation), 0)
+
+        else:
+            # Nothing new to show, but previews that were removed still need to be erased.
+            self.add_phantoms(colors)
+
+    def render_phantoms(self, index, jobs, options, bounds):
+        """Render previews on the worker pool and add them once they are all done."""
+
+        if not jobs:
+            self.add_phantoms([])
+            return
+
+        view = self.view
+        view_id = view.buffer_id()
+
+        def done(batch):
+            """Add the rendered previews, unless the buffer has changed since they were requested."""
+
+            if index.batch is not batch:
+                return
+            index.batch = None
+            scrolled = get_viewport_bounds(view) != bounds
+            if not index.update_phantoms(view, batch.swatches, batch.version):
+                return
+
+            # The phantoms may have altered the viewable region, so set previous region to the
+            # current viewable region. If the view was scrolled while rendering, keep the region
+            # that was actually scanned so that the new one gets scanned too.
+            if not scrolled:
+                self.previous_region[view_id] = get_viewport_bounds(view)
+
+        # Previews still being rendered for a previous scan are no longer needed.
+        index.cancel_render()
+        batch = RenderBatch(jobs, options, self.on_navigate, index.version, done, index.stats)
+        index.batch = batch
+        batch.start(ch_render_pool)
 
     def add_phantoms(self, colors):
-        """Add phantoms."""
+        """Add phantoms and erase any that are no longer needed, in one batch."""
 
-        i = self.view.buffer_id()
-        for html, pt, start, end, unique_id in colors:
-            pid = self.view.add_phantom(
-                'color_helper',
-                sublime.Region(pt),
-                html,
-                0,
-                on_navigate=self.on_navigate
-            )
-            self.previews[i][str(start)] = ColorSwatch(start, end, pid, unique_id)
+        get_preview_index(self.view.buffer_id()).update_phantoms(self.view, colors)
 
     def reset_previous(self):
         """Reset previous region."""
@@ -502,7 +1195,9 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
 
         # Obliterate!
         self.view.erase_phantoms('color_helper')
-        self.previews[self.view.buffer_id()].clear()
+        index = get_preview_index(self.view.buffer_id())
+        index.clear()
+        index.update_phantoms(self.view, [])
         self.reset_previous()
 
     def run(self, clear=False, force=False):
@@ -510,26 +1205,28 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
 
         self.view = self.window.active_view()
         ids = set([view.buffer_id() for view in self.window.views()])
-        keys = set(self.previews.keys())
+        keys = set(self.previous_region.keys())
         diff = keys - ids
 
         for i in diff:
-            del self.previews[i]
             del self.previous_region[i]
             del self.color_classes[i]
 
+        # Previews are tracked per buffer, and buffers may live in other windows.
+        all_ids = set([view.buffer_id() for window in sublime.windows() for view in window.views()])
+        for i in set(ch_previews.keys()) - all_ids:
+            del ch_previews[i]
+
         i = self.view.buffer_id()
-        if i not in self.previews:
-            self.previews[i] = {}
         if i not in self.previous_region:
             self.previous_region[i] = sublime.Region(0, 0)
         if i not in self.color_classes:
             self.color_classes[i] = {}
 
-        if ch_preview_thread.ignore_all:
+        if ch_preview_scheduler.ignore_all:
             return
         else:
-            ch_preview_thread.ignore_all = True
+            ch_preview_scheduler.ignore_all = True
 
         try:
             if clear:
@@ -539,48 +1236,166 @@ class ColorHelperPreviewCommand(sublime_plugin.WindowCommand):
         except Exception:
             self.erase_phantoms()
             util.debug('ColorHelper: \n' + str(traceback.format_exc()))
-        ch_preview_thread.ignore_all = False
-        ch_preview_thread.time = time()
+        ch_preview_scheduler.ignore_all = False
 
 
-class ChPreviewThread(threading.Thread):
-    """Load up defaults."""
+class ChPreviewScheduler:
+    """
+    Schedule preview updates in response to events.
+
+    Events arriving in quick succession are coalesced into a single update that runs once
+    things have settled for `inline_preview_wait_time`. Sublime does not send an event when
+    a view is scrolled with the mouse, so after any activity, the viewport is watched for
+    scrolling with an increasing delay. Once things have been idle for `inline_preview_idle_time`,
+    watching stops until the next event, unless `inline_preview_idle_scroll_wait_time` is set, in which
+    case the viewport is checked at that rate while a view has focus. Nothing runs while the editor
+    is in the background.
+    """
 
     def __init__(self):
-        """Setup the thread."""
+        """Setup the scheduler."""
+
+        self.lock = threading.Lock()
         self.reset()
-        threading.Thread.__init__(self)
 
     def reset(self):
-        """Reset the thread variables."""
-        self.wait_time = 0.12
-        self.scroll_wait_time = 0.5
-        self.sleep = 0.25
+        """Reset the scheduler variables."""
+
+        self.wait_time = int(ch_settings.get('inline_preview_wait_time', 120))
+        self.scroll_wait_time = max(
+            int(ch_settings.get('inline_preview_scroll_wait_time', 500)), MIN_SCROLL_WAIT_TIME
+        )
+        self.idle_time = int(ch_settings.get('inline_preview_idle_time', 10000))
+        # Zero disables checking for scrolling once idle.
+        self.idle_scroll_wait_time = int(ch_settings.get('inline_preview_idle_scroll_wait_time', 0))
+        if self.idle_scroll_wait_time > 0:
+            self.idle_scroll_wait_time = max(self.idle_scroll_wait_time, MIN_SCROLL_WAIT_TIME)
         self.time = time()
         self.modified = False
+        self.edited = False
+        self.scroll = False
         self.ignore_all = False
         self.abort = False
-        self.scroll = False
+        self.pending = False
+        self.first_request = 0.0
+        self.watching = False
+        self.watch_time = 0.0
+        self.watch_delay = self.scroll_wait_time
         self.last_view = -1
         self.scroll_view = None
+        self.focused = True
+
+        # Counters to measure how much work is done.
+        self.requested = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.scroll_checks = 0
+        self.latency = 0.0
+
+    def counters(self):
+        """Get the scheduler counters."""
+
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+            "scroll_checks": self.scroll_checks,
+            "latency": self.latency
+        }
+
+    def request(self, modified=False, edited=False, scroll=False):
+        """Request a preview update."""
+
+        with self.lock:
+            if self.abort:
+                return
+            self.modified = self.modified or modified
+            self.edited = self.edited or edited
+            self.scroll = self.scroll or scroll
+            self.time = time()
+            self.requested += 1
+            if self.pending:
+                self.coalesced += 1
+                return
+            self.pending = True
+            self.first_request = self.time
+        sublime.set_timeout_async(self.check, self.wait_time)
+
+    def check(self):
+        """Run the requested update once events have settled."""
+
+        with self.lock:
+            if self.abort:
+                self.pending = False
+                return
+            remaining = self.wait_time - int((time() - self.time) * 1000)
+            if self.ignore_all:
+                # Something else is currently working with the view, try again later.
+                remaining = max(remaining, self.wait_time)
+            if remaining > 0:
+                sublime.set_timeout_async(self.check, remaining)
+                return
+            self.pending = False
+            self.latency = time() - self.first_request
+
+        self.payload()
+        self.watch()
+
+    def watch(self):
+        """Watch the viewport for scrolling."""
+
+        with self.lock:
+            if self.abort:
+                return
+            self.watch_time = time()
+            self.watch_delay = self.scroll_wait_time
+            if self.watching:
+                return
+            self.watching = True
+        sublime.set_timeout_async(self.scroll_check, self.watch_delay)
+
+    def focus(self, focused):
+        """Track whether a view has focus, the viewport is only checked while idle if one does."""
+
+        with self.lock:
+            self.focused = focused
 
     def scroll_check(self):
         """Check if we should issue a scroll event."""
 
+        with self.lock:
+            idle = (time() - self.watch_time) * 1000 > self.idle_time
+            if self.abort or (idle and (not self.focused or self.idle_scroll_wait_time <= 0)):
+                self.watching = False
+                return
+            self.scroll_checks += 1
+
+        scroll = False
         view = sublime.active_window().active_view()
-        if view is None:
-            return
-        vid = view.id()
-        this_scroll = vid
-        if self.last_view != this_scroll:
-            self.last_view = this_scroll
-            self.scroll = True
-        else:
+        if view is not None:
+            vid = view.id()
             scroll_view = view.viewport_position(), view.viewport_extent()
-            if scroll_view != self.scroll_view:
-                self.scroll = True
+            if self.last_view != vid:
+                self.last_view = vid
                 self.scroll_view = scroll_view
-                self.time = time()
+                scroll = True
+            elif scroll_view != self.scroll_view:
+                self.scroll_view = scroll_view
+                scroll = True
+
+        with self.lock:
+            if scroll:
+                self.watch_time = time()
+                self.watch_delay = self.scroll_wait_time
+            elif idle:
+                # Keep checking at a low rate, as the view can still be scrolled with the mouse.
+                self.watch_delay = self.idle_scroll_wait_time
+            else:
+                # Nothing is happening, so check less often.
+                self.watch_delay = min(self.watch_delay * 2, self.scroll_wait_time * 4)
+        if scroll:
+            self.request(scroll=True)
+        sublime.set_timeout_async(self.scroll_check, self.watch_delay)
 
     def payload(self):
         """Code to run."""
@@ -592,12 +1407,13 @@ class ChPreviewThread(threading.Thread):
         if not self.ignore_all:
             clear = False
             force = False
-            if self.modified:
-                force = True
-                self.modified = False
-                self.scroll = False
-            else:
+            with self.lock:
+                if self.modified:
+                    force = True
+                    self.modified = False
+                self.edited = False
                 self.scroll = False
+                self.executed += 1
 
             # Ignore selection and edit events inside the routine
             try:
@@ -609,24 +1425,10 @@ class ChPreviewThread(threading.Thread):
                 util.debug(str(traceback.format_exc()))
 
     def kill(self):
-        """Kill thread."""
-
-        self.abort = True
-        while self.is_alive():
-            pass
-        self.reset()
-
-    def run(self):
-        """Thread loop."""
+        """Stop the scheduler, anything still pending will be ignored."""
 
-        while not self.abort:
-            if not self.ignore_all:
-                delta = time() - self.time
-                if delta > self.wait_time and (self.modified is True or self.scroll is True):
-                    sublime.set_timeout_async(self.payload, 0)
-                elif delta > self.scroll_wait_time:
-                    sublime.set_timeout_async(self.scroll_check, 0)
-            sleep(self.sleep)
+        with self.lock:
+            self.abort = True
 
 
 class ColorHelperListener(sublime_plugin.EventListener):
@@ -638,20 +1440,44 @@ class ColorHelperListener(sublime_plugin.EventListener):
         if self.ignore_event(view):
             return
 
-        if ch_preview_thread is not None:
-            ch_preview_thread.modified = True
-            ch_preview_thread.time = time()
+        if ch_preview_scheduler is not None:
+            # If text changes are tracked for this buffer, only the edited lines need updating.
+            if TRACK_TEXT_CHANGES and view.buffer_id() in ch_previews:
+                ch_preview_scheduler.request(edited=True)
+            else:
+                ch_preview_scheduler.request(modified=True)
 
     def on_selection_modified(self, view):
         """Flag that we need to show a tooltip."""
         if self.ignore_event(view):
             return
 
-        if ch_preview_thread is not None and ch_settings.get("preview_on_select", False):
+        if ch_settings.get("preview_on_select", False):
             # We only render previews when things change or a scroll occurs.
             # On selection, we just need to force the change.
-            ch_preview_thread.time = time()
-            ch_preview_thread.modified = True
+            ch_preview_scheduler.request(modified=True)
+        else:
+            # Moving the selection may have scrolled the view.
+            ch_preview_scheduler.watch()
+
+    def on_post_text_command(self, view, command_name, args):
+        """Update previews after commands that scroll the view."""
+
+        if self.ignore_event(view):
+            return
+
+        if command_name in SCROLL_COMMANDS:
+            ch_preview_scheduler.request(scroll=True)
+        else:
+            ch_preview_scheduler.watch()
+
+    def on_hover(self, view, point, hover_zone):
+        """Watch for scrolling when the mouse is over a view, as mouse wheel scrolling does not send an event."""
+
+        if self.ignore_event(view):
+            return
+
+        ch_preview_scheduler.watch()
 
     def on_activated(self, view):
         """On activated."""
@@ -659,16 +1485,27 @@ class ColorHelperListener(sublime_plugin.EventListener):
         if self.ignore_event(view):
             return
 
+        ch_preview_scheduler.focus(True)
+
         if self.should_update(view):
-            ch_preview_thread.modified = True
-            ch_preview_thread.time = time()
+            ch_preview_scheduler.request(modified=True)
             self.set_file_scan_rules(view)
+        else:
+            ch_preview_scheduler.request(scroll=True)
+
+    def on_deactivated(self, view):
+        """Stop checking the viewport once idle while no view has focus."""
+
+        if self.ignore_event(view):
+            return
+
+        ch_preview_scheduler.focus(False)
 
     def set_file_scan_rules(self, view):
         """Set the scan rules for the current view."""
 
-        if ch_preview_thread:
-            ch_preview_thread.ignore_all = True
+        if ch_preview_scheduler:
+            ch_preview_scheduler.ignore_all = True
 
         view.settings().clear_on_change('color_helper.reload')
         view.window().run_command("color_helper_preview", {"clear": True})
@@ -770,12 +1607,12 @@ class ColorHelperListener(sublime_plugin.EventListener):
             )
 
         # Watch for settings changes so we can update if necessary.
-        if ch_preview_thread is not None:
+        if ch_preview_scheduler is not None:
             if not unloading:
                 view.settings().add_on_change(
                     'color_helper.reload', lambda view=view: self.on_view_settings_change(view)
                 )
-            ch_preview_thread.ignore_all = False
+            ch_preview_scheduler.ignore_all = False
 
     def should_update(self, view):
         """Check if an update should be performed."""
@@ -811,20 +1648,41 @@ class ColorHelperListener(sublime_plugin.EventListener):
                 if old_syntax is None or old_syntax != syntax:
                     self.on_activated(view)
                 if settings.get('color_scheme') != settings.get('color_helper.color_scheme', ''):
-                    ch_preview_thread.modified = True
-                    ch_preview_thread.time = time()
+                    ch_preview_scheduler.request(modified=True)
 
     def ignore_event(self, view):
         """Check if event should be ignored."""
 
         return (
             view.settings().get('is_widget', False) or
-            ch_preview_thread is None or
-            ch_preview_thread.ignore_all or
+            ch_preview_scheduler is None or
+            ch_preview_scheduler.ignore_all or
             unloading
         )
 
 
+if TRACK_TEXT_CHANGES:
+    class ColorHelperTextChangeListener(sublime_plugin.TextChangeListener):
+        """Track text changes so previews can be updated incrementally."""
+
+        @classmethod
+        def is_applicable(cls, buffer):
+            """Attach to every buffer that isn't a widget."""
+
+            view = buffer.primary_view()
+            return view is not None and not view.settings().get('is_widget', False)
+
+        def on_text_changed(self, changes):
+            """Record the changes in the buffer's preview index."""
+
+            index = ch_previews.get(self.buffer.id())
+            if index is None:
+                return
+
+            for change in changes:
+                index.text_changed(change.a.pt, change.b.pt, len(change.str))
+
+
 ###########################
 # Plugin Initialization
 ###########################
@@ -834,18 +1692,25 @@ def settings_reload():
     global reload_flag
     reload_flag = True
     ch_last_updated = time()
+    ch_swatch.setup(ch_settings)
+    # The picker keeps rendered swatches, which may have been rendered with a different mode or backend.
+    ch_picker.clear_cache()
     setup_previews()
 
 
 def setup_previews():
     """Setup previews."""
 
-    global ch_preview_thread
+    global ch_preview_scheduler
+    global ch_render_pool
     global unloading
 
     unloading = True
-    if ch_preview_thread is not None:
-        ch_preview_thread.kill()
+    if ch_preview_scheduler is not None:
+        ch_preview_scheduler.kill()
+    if ch_render_pool is not None:
+        ch_render_pool.shutdown(wait=False)
+        ch_render_pool = None
     for w in sublime.windows():
         for v in w.views():
             v.settings().clear_on_change('color_helper.reload')
@@ -853,11 +1718,15 @@ def setup_previews():
             v.settings().erase('color_helper.scan_override')
             v.settings().set('color_helper.refresh', True)
             v.erase_phantoms('color_helper')
+    for index in ch_previews.values():
+        index.cancel_render()
+    ch_previews.clear()
     unloading = False
 
     if ch_settings.get('inline_previews', False):
-        ch_preview_thread = ChPreviewThread()
-        ch_preview_thread.start()
+        ch_render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS)
+        ch_preview_scheduler = ChPreviewScheduler()
+        ch_preview_scheduler.watch()
 
 
 def plugin_loaded():
@@ -884,8 +1753,10 @@ def plugin_unloaded():
     global unloading
     unloading = True
 
-    if ch_preview_thread is not None:
-        ch_preview_thread.kill()
+    if ch_preview_scheduler is not None:
+        ch_preview_scheduler.kill()
+    if ch_render_pool is not None:
+        ch_render_pool.shutdown(wait=False)
 
     # Clear view events
     ch_settings.clear_on_change('reload')
@@ -895,5 +1766,8 @@ def plugin_unloaded():
             v.settings().erase('color_helper.scan')
             v.settings().erase('color_helper.scan_override')
             v.erase_phantoms('color_helper')
+    for index in ch_previews.values():
+        index.cancel_render()
+    ch_previews.clear()
 
     unloading = False
@@ -0,0 +1,192 @@
+"""
+Color swatches.
+
+Color previews, panels, the picker, and the tools get their gamut mapped colors, borders, and
+encoded swatches from here, so they are shown the same way everywhere.
+"""
+from .lib import colorbox
+from .lib.coloraide import Color
+from .lib.coloraide import gamut
+from . import ch_util as util
+from collections import namedtuple
+
+FIT_CACHE_SIZE = 1024
+
+# Previews are only approximations of out of gamut colors, so use the fastest gamut mapping by default.
+DEFAULT_FIT_METHOD = 'oklch-boundary'
+
+fit_method = DEFAULT_FIT_METHOD
+
+fit_cache = gamut.FitCache(FIT_CACHE_SIZE)
+
+
+class Preview(namedtuple('Preview', ['preview1', 'preview2', 'border', 'message'])):
+    """Preview."""
+
+
+class SwatchStyle(
+    namedtuple(
+        'SwatchStyle',
+        ['gamut_space', 'show_out_of_gamut_preview', 'border', 'out_of_gamut', 'out_of_gamut_border']
+    )
+):
+    """How colors are previewed."""
+
+
+def setup(settings):
+    """Setup swatch rendering from the settings."""
+
+    global fit_method
+
+    fit_method = settings.get('preview_fit_method', DEFAULT_FIT_METHOD)
+    if fit_method != 'clip' and fit_method not in Color.FIT_MAP:
+        fit_method = DEFAULT_FIT_METHOD
+    colorbox.set_png_mode(settings.get('swatch_png_mode', colorbox.PNG_PALETTE))
+    colorbox.set_backend(settings.get('swatch_backend', colorbox.PNGSwatchBackend.NAME))
+
+
+def clear_cache():
+    """Clear the swatch and gamut fitting caches."""
+
+    colorbox.clear_cache()
+    fit_cache.clear()
+
+
+def cache_info():
+    """Get swatch cache info."""
+
+    return colorbox.cache_info()
+
+
+def in_preview_gamut(color, gamut_space):
+    """Check if the color can be shown in the gamut space."""
+
+    if gamut_space == 'srgb':
+        check_space = gamut_space if color.space() not in util.SRGB_SPACES else color.space()
+    else:
+        check_space = gamut_space
+    return color.in_gamut(check_space)
+
+
+def fit(color, gamut_space):
+    """Fit the color to the gamut space with the preview fit method, returning a new color in that space."""
+
+    return gamut.fit_colors([color], gamut_space, method=fit_method, cache=fit_cache)[0]
+
+
+def get_border(background, gamut_space, border_color=None):
+    """
+    Get the border for swatches shown over the background.
+
+    If `border_color` is a valid color, it is used, otherwise the border is the background
+    made lighter or darker so that it stands out.
+    """
+
+    if border_color is not None:
+        try:
+            return fit(Color(border_color), gamut_space)
+        except Exception:
+            pass
+
+    hsl = Color(background, filters=util.CSS_SRGB_SPACES).convert('hsl')
+    hsl.lightness = hsl.lightness + (0.3 if hsl.luminance() < 0.5 else -0.3)
+    return fit(hsl, gamut_space).set('alpha', 1)
+
+
+def get_out_of_gamut(warning, gamut_space):
+    """Get the color and border shown in place of colors that are out of gamut."""
+
+    return (
+        Color('transparent').convert(gamut_space),
+        Color(warning, filters=util.CSS_SRGB_SPACES).convert(gamut_space)
+    )
+
+
+def get_preview(color, style):
+    """Get the colors and border to preview the color with, fitting it to the gamut space if needed."""
+
+    return get_previews([color], style)[0]
+
+
+def get_previews(colors, style, borders=None):
+    """
+    Get the previews for a batch of colors.
+
+    Colors that need to be shown are fitted to the gamut space together, and fitted colors are cached,
+    so repeated colors are only fitted once. If `borders` is given, it provides the border for each color
+    in place of the style's border.
+    """
+
+    messages = []
+    fit_list = []
+    for color in colors:
+        if in_preview_gamut(color, style.gamut_space):
+            messages.append('')
+            fit_list.append(color)
+        else:
+            messages.append('preview out of gamut')
+            if style.show_out_of_gamut_preview:
+                fit_list.append(color)
+
+    fitted = iter(gamut.fit_colors(fit_list, style.gamut_space, method=fit_method, cache=fit_cache))
+
+    previews = []
+    for i, message in enumerate(messages):
+        preview_border = style.border if borders is None else borders[i]
+        if not message or style.show_out_of_gamut_preview:
+            pcolor = next(fitted)
+            preview1 = pcolor.clone().set('alpha', 1)
+            preview2 = pcolor
+        else:
+            preview1 = style.out_of_gamut
+            preview2 = style.out_of_gamut
+            preview_border = style.out_of_gamut_border
+        previews.append(Preview(preview1, preview2, preview_border, message))
+    return previews
+
+
+def get_second_border(border, gamut_space):
+    """Get an inner border that stands out from the given border."""
+
+    temp = Color(border)
+    if temp.luminance() < 0.5:
+        second_border = temp.mix('white', 0.25, space=gamut_space, out_space=gamut_space)
+    else:
+        second_border = temp.mix('black', 0.25, space=gamut_space, out_space=gamut_space)
+    second_border.set('alpha', 1)
+    return second_border
+
+
+def color_box(
+    colors, border=None, border2=None, height=32, width=32,
+    border_size=1, check_size=4, max_colors=5, alpha=False, border_map=0xF,
+    gamut_space='srgb'
+):
+    """Render a swatch of the colors."""
+
+    return colorbox.color_box(
+        colors, border, border2, height, width,
+        border_size, check_size, max_colors, alpha, border_map,
+        gamut_space
+    )
+
+
+def preview_box(preview, border2=None, **kwargs):
+    """Render a swatch of a preview, showing the color both without and with transparency."""
+
+    return color_box([preview.preview1, preview.preview2], preview.border, border2, **kwargs)
+
+
+def get_tool_preview(color, style, **kwargs):
+    """
+    Get the preview of a color shown in a tool along with its swatch.
+
+    Tools always show the color, fitted to the gamut space if needed, and use an inner border
+    to set the larger swatch apart. Keyword arguments are passed on to `color_box`.
+    """
+
+    preview = get_preview(color, style._replace(show_out_of_gamut_preview=True))
+    swatch = preview_box(
+        preview, get_second_border(preview.border, style.gamut_space), gamut_space=style.gamut_space, **kwargs
+    )
+    return preview, swatch
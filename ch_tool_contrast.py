@@ -4,6 +4,7 @@ import sublime_plugin
 from .lib.coloraide import Color
 import mdpopups
 from . import ch_util as util
+from . import ch_swatch
 from .ch_mixin import _ColorMixin
 import copy
 from . import ch_tools as tools
@@ -115,11 +116,11 @@ def evaluate(string):
 
         # Package up the color, or the two reference colors along with the mixed.
         if first:
-            colors.append(first.fit('srgb', in_place=True))
+            colors.append(first.update(ch_swatch.fit(first, 'srgb')))
         if second:
             if second.alpha < 1.0:
                 second.alpha = 1.0
-            colors.append(second.fit('srgb', in_place=True))
+            colors.append(second.update(ch_swatch.fit(second, 'srgb')))
             if ratio:
                 if first.alpha < 1.0:
                     first = first.compose(second, space="srgb")
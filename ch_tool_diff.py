@@ -2,7 +2,7 @@
 import sublime
 import sublime_plugin
 from .lib.coloraide import Color
-from .lib import colorbox
+from . import ch_swatch
 import mdpopups
 from . import ch_util as util
 from .ch_mixin import _ColorMixin
@@ -177,40 +177,25 @@ class ColorHelperDifferenceInputHandler(tools._ColorInputHandler):
             html = mdpopups.md2html(self.view, DEF_DIFF.format(style))
             html = ""
             for color in colors:
-                orig = Color(color)
-                message = ""
-                color_string = ""
-                if self.gamut_space == 'srgb':
-                    check_space = self.gamut_space if orig.space() not in util.SRGB_SPACES else orig.space()
-                else:
-                    check_space = self.gamut_space
-                if not orig.in_gamut(check_space):
-                    orig.fit(self.gamut_space, in_place=True)
-                    message = '<br><em style="font-size: 0.9em;">* preview out of gamut</em>'
-                    color_string = "<strong>Gamut Mapped</strong>: {}<br>".format(orig.to_string())
-                orig.convert(self.gamut_space, fit=True, in_place=True)
-                color_string += "<strong>Color</strong>: {}".format(color.to_string(**util.DEFAULT))
-                preview = orig.clone().set('alpha', 1)
-                preview_alpha = orig
-                preview_border = self.default_border
-                temp = Color(preview_border)
-                if temp.luminance() < 0.5:
-                    second_border = temp.mix('white', 0.25, space=self.gamut_space, out_space=self.gamut_space)
-                    second_border.set('alpha', 1)
-                else:
-                    second_border = temp.mix('black', 0.25, space=self.gamut_space, out_space=self.gamut_space)
-                    second_border.set('alpha', 1)
-
                 height = self.height * 3
                 width = self.width * 3
                 check_size = self.check_size(height, scale=8)
 
+                preview, swatch = ch_swatch.get_tool_preview(
+                    Color(color), self.get_swatch_style(),
+                    border_size=2, height=height, width=width, check_size=check_size
+                )
+                message = ""
+                color_string = ""
+                if preview.message:
+                    message = '<br><em style="font-size: 0.9em;">* {}</em>'.format(preview.message)
+                    color_string = "<strong>Gamut Mapped</strong>: {}<br>".format(
+                        preview.preview2.convert(color.space()).to_string()
+                    )
+                color_string += "<strong>Color</strong>: {}".format(color.to_string(**util.DEFAULT))
+
                 html += tools.PREVIEW_IMG.format(
-                    colorbox.color_box(
-                        [preview, preview_alpha],
-                        preview_border, second_border,
-                        border_size=2, height=height, width=width, check_size=check_size
-                    ),
+                    swatch,
                     message,
                     color_string
                 )
@@ -35,6 +35,7 @@ class ASRGB(SRGB):
     """SRGB that looks for alpha first in hex format."""
 
     COLOR_FORMAT = False
+    MATCH_PATTERN = MATCH
 
     @classmethod
     def match(cls, string, start=0, fullmatch=True):
@@ -32,6 +32,8 @@ def split_channels(color: str):
 class AssABGR(SRGB):
     """ASS `ABGR` color space."""
 
+    MATCH_PATTERN = MATCH
+
     @classmethod
     def match(cls, string: str, start: int = 0, fullmatch: bool = True):
         """Match a color string."""
@@ -10,6 +10,8 @@ MATCH = re.compile(r"\b0x(?:[0-9a-fA-f]{8}|[0-9a-fA-f]{6})\b")
 class HexSRGB(SRGB):
     """SRGB that looks for alpha first in hex format."""
 
+    MATCH_PATTERN = MATCH
+
     @classmethod
     def match(cls, string, start=0, fullmatch=True):
         """Match a CSS color string."""
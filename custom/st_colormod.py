@@ -179,6 +179,8 @@ def handle_vars(string, variables, parents=None):
 class HWB(HWBORIG):
     """HWB class that allows commas."""
 
+    MATCH_PATTERN = HWB_MATCH
+
     @classmethod
     def match(cls, string, start=0, fullmatch=True):
         """Match a CSS color string."""
@@ -679,7 +681,7 @@ class Color(ColorCSS):
             if obj is not None:
                 return obj._space, start, end if end is not None else match_end
         else:
-            return super()._match(string, start, fullmatch)
+            return super()._match(string, start, fullmatch, filters=filters)
         return None
 
     @classmethod
@@ -693,6 +693,8 @@ def name2hex(name):
 class SRGBX11(SRGB):
     """sRGB class."""
 
+    MATCH_PATTERN = MATCH
+
     def to_string(
         self, parent, *, alpha=None, precision=None, fit=True, none=False, **kwargs
     ):
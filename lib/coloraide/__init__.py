@@ -1,7 +1,8 @@
 """ColorAide Library."""
 from .__meta__ import __version_info__, __version__  # noqa: F401
 from .color import Color, ColorMatch
+from .value import ColorValue
 from .interpolate import Piecewise, Lerp
 from .algebra import NaN
 
-__all__ = ("Color", "ColorMatch", "NaN", "Piecewise", "Lerp")
+__all__ = ("Color", "ColorMatch", "ColorValue", "NaN", "Piecewise", "Lerp")
@@ -261,6 +261,80 @@ def dot(
     return multiply(a, b, dims=(dims_a, dims_b))
 
 
+def matmul3x3_vec3(m: MatrixLike, v: VectorLike) -> Vector:
+    """
+    Dot a 3x3 matrix and a 3 element vector.
+
+    Gives the same result as `dot(m, v, dims=D2_D1)`. Sums start from an integer zero, like `sum`,
+    so even the sign of zero matches.
+    """
+
+    x, y, z = v
+    r1, r2, r3 = m
+    return [
+        0 + r1[0] * x + r1[1] * y + r1[2] * z,
+        0 + r2[0] * x + r2[1] * y + r2[2] * z,
+        0 + r3[0] * x + r3[1] * y + r3[2] * z
+    ]
+
+
+def matmul3x3(a: MatrixLike, b: MatrixLike) -> Matrix:
+    """
+    Dot two 3x3 matrices.
+
+    Gives the same result as `dot(a, b, dims=D2)`.
+    """
+
+    (b11, b12, b13), (b21, b22, b23), (b31, b32, b33) = b
+    return [
+        [
+            0 + r[0] * b11 + r[1] * b21 + r[2] * b31,
+            0 + r[0] * b12 + r[1] * b22 + r[2] * b32,
+            0 + r[0] * b13 + r[1] * b23 + r[2] * b33
+        ]
+        for r in a
+    ]
+
+
+def inv3x3(matrix: MatrixLike) -> Matrix:
+    """
+    Invert a 3x3 matrix.
+
+    The same Gauss-Jordan elimination as `inv`, with the loops unrolled, so results are the same.
+    """
+
+    m = [list(matrix[0]), list(matrix[1]), list(matrix[2])]
+    im = [[1, 0.0, 0.0], [0.0, 1, 0.0], [0.0, 0.0, 1]]  # type: List[List[float]]
+
+    for fd, others in ((0, (1, 2)), (1, (0, 2)), (2, (0, 1))):
+        row = m[fd]
+        irow = im[fd]
+        denom = row[fd]
+        if denom == 0:
+            raise ValueError('Matrix is not invertable')
+
+        fd_scalar = 1.0 / denom
+        row[0] *= fd_scalar
+        row[1] *= fd_scalar
+        row[2] *= fd_scalar
+        irow[0] *= fd_scalar
+        irow[1] *= fd_scalar
+        irow[2] *= fd_scalar
+
+        for cr in others:
+            r = m[cr]
+            ir = im[cr]
+            cr_scalar = r[fd]
+            r[0] -= cr_scalar * row[0]
+            r[1] -= cr_scalar * row[1]
+            r[2] -= cr_scalar * row[2]
+            ir[0] -= cr_scalar * irow[0]
+            ir[1] -= cr_scalar * irow[1]
+            ir[2] -= cr_scalar * irow[2]
+
+    return im
+
+
 def _matrix_chain_order(dims: List[Tuple[int, int]]) -> List[List[int]]:
     """
     Calculate chain order.
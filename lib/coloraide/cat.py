@@ -116,15 +116,15 @@ def calc_adaptation_matrices(
         m = CATS[method]
     except KeyError:  # pragma: no cover
         raise ValueError('Unknown chromatic adaptation method encountered: {}'.format(method))
-    mi = alg.inv(m)
+    mi = alg.inv3x3(m)
 
     try:
-        first = alg.dot(m, util.xy_to_xyz(w1), dims=alg.D2_D1)
+        first = alg.matmul3x3_vec3(m, util.xy_to_xyz(w1))
     except KeyError:  # pragma: no cover
         raise ValueError('Unknown white point encountered: {}'.format(w1))
 
     try:
-        second = alg.dot(m, util.xy_to_xyz(w2), dims=alg.D2_D1)
+        second = alg.matmul3x3_vec3(m, util.xy_to_xyz(w2))
     except KeyError:  # pragma: no cover
         raise ValueError('Unknown white point encountered: {}'.format(w2))
 
@@ -132,9 +132,9 @@ def calc_adaptation_matrices(
         Matrix,
         alg.diag(cast(Vector, alg.divide(cast(Vector, first), cast(Vector, second), dims=alg.D1)))
     )
-    adapt = cast(Matrix, alg.multi_dot([mi, m2, m]))
+    adapt = alg.matmul3x3(mi, alg.matmul3x3(m2, m))
 
-    return adapt, alg.inv(adapt)
+    return adapt, alg.inv3x3(adapt)
 
 
 def get_adaptation_matrix(w1: Tuple[float, float], w2: Tuple[float, float], method: str) -> Matrix:
@@ -164,4 +164,4 @@ def chromatic_adaptation(
         return list(xyz)
     else:
         # Get the appropriate chromatic adaptation matrix and apply.
-        return cast(Vector, alg.dot(get_adaptation_matrix(w1, w2, method), xyz, dims=alg.D2_D1))
+        return alg.matmul3x3_vec3(get_adaptation_matrix(w1, w2, method), xyz)
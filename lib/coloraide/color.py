@@ -9,7 +9,7 @@ from . import compositing
 from . import interpolate
 from . import util
 from . import algebra as alg
-from .css import parse
+from .match import Matcher
 from .types import VectorLike, Vector, ColorInput
 from .spaces import Space, Cylindrical
 from .spaces.hsv import HSV
@@ -53,7 +53,8 @@ from .gamut import Fit
 from .gamut.fit_lch_chroma import LchChroma
 from .gamut.fit_oklch_chroma import OklchChroma
 from .gamut.fit_css_color_4 import CssColor4
-from typing import Union, Sequence, Dict, List, Optional, Any, cast, Callable, Set, Tuple, Type, Mapping
+from .gamut.fit_oklch_boundary import OklchBoundary
+from typing import Union, Sequence, Dict, List, Optional, Any, cast, Callable, Tuple, Type, Mapping, FrozenSet, Iterable
 
 SUPPORTED_DE = (
     DE76, DE94, DECMC, DE2000, DEITP, DE99o, DEZ, DEHyAB, DEOK
@@ -67,7 +68,7 @@ SUPPORTED_SPACES = (
 )
 
 SUPPORTED_FIT = (
-    LchChroma, OklchChroma, CssColor4
+    LchChroma, OklchChroma, CssColor4, OklchBoundary
 )
 
 
@@ -99,6 +100,8 @@ class BaseColor(abc.ABCMeta):
             cls.CS_MAP = cls.CS_MAP.copy()  # type: Dict[str, Type[Space]]
             cls.DE_MAP = cls.DE_MAP.copy()  # type: Dict[str, Type[DeltaE]]
             cls.FIT_MAP = cls.FIT_MAP.copy()  # type: Dict[str, Type[Fit]]
+        cls._MATCHERS = {}  # type: Dict[FrozenSet[str], Matcher]
+        cls._CONVERSIONS = {}  # type: Dict[Tuple[Type[Space], str, str], convert.Plan]
 
 
 class Color(metaclass=BaseColor):
@@ -107,6 +110,8 @@ class Color(metaclass=BaseColor):
     CS_MAP = {}  # type: Dict[str, Type[Space]]
     DE_MAP = {}  # type: Dict[str, Type[DeltaE]]
     FIT_MAP = {}  # type: Dict[str, Type[Fit]]
+    _MATCHERS = {}  # type: Dict[FrozenSet[str], Matcher]
+    _CONVERSIONS = {}  # type: Dict[Tuple[Type[Space], str, str], convert.Plan]
     PRECISION = util.DEF_PREC
     FIT = util.DEF_FIT
     INTERPOLATE = util.DEF_INTERPOLATE
@@ -217,24 +222,22 @@ class Color(metaclass=BaseColor):
         This must return the color space, not the Color object.
         """
 
-        filter_set = set(filters) if filters is not None else set()  # type: Set[str]
+        return cls._get_matcher(filters).match(string, start, fullmatch)
 
-        # Attempt color match
-        m = parse.parse_color(string, cls.CS_MAP, start, fullmatch)
-        if m is not None:
-            if not filter_set or m[0].NAME in filter_set:
-                return m[0](*m[1]), start, m[2]
-            return None
-
-        # Attempt color space specific match
-        for space, space_class in cls.CS_MAP.items():
-            if filter_set and space not in filter_set:
-                continue
-            m2 = space_class.match(string, start, fullmatch)
-            if m2 is not None:
-                color = space_class(*m2[0])
-                return color, start, m2[1]
-        return None
+    @classmethod
+    def _get_matcher(cls, filters: Optional[Sequence[str]] = None) -> Matcher:
+        """
+        Get the matcher for the given filters.
+
+        Matchers are cached per filter set and are cleared whenever color spaces are registered or deregistered.
+        """
+
+        key = frozenset(filters) if filters else frozenset()
+        matcher = cls._MATCHERS.get(key)
+        if matcher is None:
+            matcher = Matcher(cls.CS_MAP, key)
+            cls._MATCHERS[key] = matcher
+        return matcher
 
     @classmethod
     def match(
@@ -280,6 +283,8 @@ class Color(metaclass=BaseColor):
         for p in plugin:
             if issubclass(p, Space):
                 mapping = cls.CS_MAP
+                cls._MATCHERS.clear()
+                cls._CONVERSIONS.clear()
             elif issubclass(p, DeltaE):
                 mapping = cls.DE_MAP
             elif issubclass(p, Fit):
@@ -310,11 +315,15 @@ class Color(metaclass=BaseColor):
                 cls.CS_MAP.clear()
                 cls.DE_MAP.clear()
                 cls.FIT_MAP.clear()
+                cls._MATCHERS.clear()
+                cls._CONVERSIONS.clear()
                 return
 
             ptype, name = p.split(':', 1)
             if ptype == 'space':
                 mapping = cls.CS_MAP
+                cls._MATCHERS.clear()
+                cls._CONVERSIONS.clear()
             elif ptype == "delta-e":
                 mapping = cls.DE_MAP
             elif ptype == "fit":
@@ -405,6 +414,12 @@ class Color(metaclass=BaseColor):
 
         return self.mutate(space, coords, self.alpha) if in_place else self.new(space, coords, self.alpha)
 
+    @classmethod
+    def convert_many(cls, coords: Iterable[VectorLike], space: str, target: str) -> List[Vector]:
+        """Convert many sets of coordinates from one color space to another."""
+
+        return convert.convert_many(cls, coords, space, target)
+
     def mutate(
         self,
         color: ColorInput,
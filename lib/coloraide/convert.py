@@ -1,97 +1,216 @@
 """Convert the color."""
 from . import algebra as alg
 from . import cat
-from .types import Vector
-from typing import TYPE_CHECKING
+from .types import Vector, VectorLike, Matrix, ConvertStep
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple, Type
 
 if TYPE_CHECKING:  # pragma: no cover
     from .color import Color
+    from .spaces import Space
+
+# Steps that convert coordinates from one color space to another
+Plan = Tuple[Callable[[Vector], Vector], ...]
 
 # XYZ is the absolute base, meaning that XYZ is the final base in any conversion chain.
 # This is a design expectation regardless of whether someone assigns a different base to XYZ or not.
 ABSOLUTE_BASE = 'xyz-d65'
 
 
-def convert(color: 'Color', space: str) -> Vector:
-    """Convert the color coordinates to the specified space."""
+def adaptation_matrix(w1: Tuple[float, float], w2: Tuple[float, float], method: str) -> Optional[Matrix]:
+    """Get the matrix that chromatically adapts between the white points, if they differ."""
 
-    if color.space() != space:
-        obj = color.CS_MAP.get(space)
-        if obj is None:
-            raise ValueError("'{}' is not a valid color space".format(space))
+    if w1 == w2:
+        return None
+    return cat.get_adaptation_matrix(w1, w2, method)
+
+
+def get_steps(space: Type['Space'], method: str) -> List[ConvertStep]:
+    """
+    Get the steps that are equivalent to the color space's `to_base` or `from_base`.
+
+    Steps are only used if they are defined by the same class that defines the method,
+    as a subclass may override the method without providing its steps.
+    """
+
+    attr = 'TO_BASE_STEPS' if method == 'to_base' else 'FROM_BASE_STEPS'
+    for klass in space.__mro__:  # pragma: no branch
+        if method in vars(klass):
+            steps = vars(klass).get(attr)
+            if steps is not None:
+                return list(steps)
+            break
+    return [getattr(space, method)]
+
+
+class Transform:
+    """A conversion step that applies a 3x3 matrix."""
+
+    __slots__ = ('matrix',)
+
+    def __init__(self, matrix: Matrix) -> None:
+        """Initialize."""
+
+        self.matrix = matrix
+
+    def __call__(self, coords: Vector) -> Vector:
+        """Apply the matrix to the coordinates."""
+
+        return alg.matmul3x3_vec3(self.matrix, coords)
+
+
+def compile_steps(steps: List[ConvertStep]) -> Plan:
+    """Combine consecutive matrices into one and turn them into steps that apply them."""
+
+    plan = []  # type: List[Callable[[Vector], Vector]]
+    matrix = None  # type: Optional[Matrix]
+    for step in steps:
+        if callable(step):
+            if matrix is not None:
+                plan.append(Transform(matrix))
+                matrix = None
+            plan.append(step)
+        else:
+            matrix = step if matrix is None else alg.matmul3x3(step, matrix)
+    if matrix is not None:
+        plan.append(Transform(matrix))
+    return tuple(plan)
+
+
+def build_plan(color_cls: Type['Color'], current: Type['Space'], space: str) -> Plan:
+    """
+    Build the steps that convert coordinates from the current color space to the specified space.
+
+    Consecutive linear transforms, including chromatic adaptation, are combined into one matrix.
+    """
+
+    obj = color_cls.CS_MAP.get(space)
+    if obj is None:
+        raise ValueError("'{}' is not a valid color space".format(space))
+
+    # Create a worse case conversion chain from XYZ to the target
+    temp = obj
+    count = 0
+    from_color = []
+    from_color_index = {}
+    name = ''
+    while name != ABSOLUTE_BASE:
+        from_color.append(temp)
+        name = temp.NAME
+        from_color_index[name] = count
+        temp = color_cls.CS_MAP[temp.BASE]
+
+        count += 1
+        if count > color_cls._MAX_CONVERT_ITERATIONS:  # pragma: no cover
+            raise RuntimeError(
+                'Conversion chain reached max size of {} and has terminated to avoid an infinite loop'.format(
+                    count
+                )
+            )
+
+    steps = []  # type: List[ConvertStep]
+    adapt = None  # type: Optional[Matrix]
 
-        # Create a worse case conversion chain from XYZ to the target
-        temp = obj
+    # Start converting coordinates until we either match a space in the conversion chain or bottom out at XYZ D65
+    if current.NAME != ABSOLUTE_BASE:
         count = 0
-        from_color = []
-        from_color_index = {}
-        name = ''
-        while name != ABSOLUTE_BASE:
-            from_color.append(temp)
-            name = temp.NAME
-            from_color_index[name] = count
-            temp = color.CS_MAP[temp.BASE]
+        while current.NAME not in from_color_index:
+            # Convert to color's base
+            base_space = color_cls.CS_MAP[current.BASE]
+            steps.extend(get_steps(current, 'to_base'))
+
+            # Convert to XYZ, make sure we chromatically adapt to the appropriate white point
+            if base_space.NAME == ABSOLUTE_BASE:
+                adapt = adaptation_matrix(current.WHITE, base_space.WHITE, color_cls.CHROMATIC_ADAPTATION)
+                if adapt is not None:
+                    steps.append(adapt)
+
+            # Get next color in the chain
+            current = base_space
 
             count += 1
-            if count > color._MAX_CONVERT_ITERATIONS:  # pragma: no cover
+            if count > color_cls._MAX_CONVERT_ITERATIONS:  # pragma: no cover
                 raise RuntimeError(
-                    'Conversion chain reached max size of {} and has terminated to avoid an infinite loop'.format(
+                    'Conversions reached max iteration of {} and has terminated to avoid an infinite loop'.format(
                         count
                     )
                 )
 
-        # Treat undefined channels as zero
-        coords = alg.no_nans(color.coords())
+    # If we still do not match start converting from the point in the conversion chain
+    # where are current color resides
+    if current.NAME != space:
+        start = from_color_index[current.NAME] - 1
 
-        # Start converting coordinates until we either match a space in the conversion chain or bottom out at XYZ D65
-        current = type(color._space)
-        if current.NAME != ABSOLUTE_BASE:
-            count = 0
-            while current.NAME not in from_color_index:
-                # Convert to color's base
-                base_space = color.CS_MAP[current.BASE]
-                coords = current.to_base(coords)
-
-                # Convert to XYZ, make sure we chromatically adapt to the appropriate white point
-                if base_space.NAME == ABSOLUTE_BASE:
-                    coords = cat.chromatic_adaptation(
-                        current.WHITE,
-                        base_space.WHITE,
-                        coords,
-                        color.CHROMATIC_ADAPTATION
-                    )
+        # Convert from XYZ, make sure we chromatically adapt from the appropriate white point
+        if current.NAME == ABSOLUTE_BASE:
+            adapt = adaptation_matrix(current.WHITE, from_color[start].WHITE, color_cls.CHROMATIC_ADAPTATION)
+            if adapt is not None:
+                steps.append(adapt)
 
-                # Get next color in the chain
-                current = base_space
+        for index in range(start, -1, -1):
+            steps.extend(get_steps(from_color[index], 'from_base'))
 
-                count += 1
-                if count > color._MAX_CONVERT_ITERATIONS:  # pragma: no cover
-                    raise RuntimeError(
-                        'Conversions reached max iteration of {} and has terminated to avoid an infinite loop'.format(
-                            count
-                        )
-                    )
+    return compile_steps(steps)
 
-        # If we still do not match start converting from the point in the conversion chain
-        # where are current color resides
-        if current.NAME != space:
-            start = from_color_index[current.NAME] - 1
-
-            # Convert from XYZ, make sure we chromatically adapt from the appropriate white point
-            if current.NAME == ABSOLUTE_BASE:
-                coords = cat.chromatic_adaptation(
-                    current.WHITE,
-                    from_color[start].WHITE,
-                    coords,
-                    color.CHROMATIC_ADAPTATION
-                )
 
-            for index in range(start, -1, -1):
-                current = from_color[index]
-                coords = current.from_base(coords)
+def get_plan(color_cls: Type['Color'], current: Type['Space'], space: str) -> Plan:
+    """
+    Get the steps that convert coordinates from the current color space to the specified space.
+
+    Plans are cached per color class, and are cleared whenever color spaces are registered or deregistered.
+    """
+
+    key = (current, space, color_cls.CHROMATIC_ADAPTATION)
+    plan = color_cls._CONVERSIONS.get(key)
+    if plan is None:
+        plan = build_plan(color_cls, current, space)
+        color_cls._CONVERSIONS[key] = plan
+    return plan
+
+
+def convert(color: 'Color', space: str) -> Vector:
+    """Convert the color coordinates to the specified space."""
+
+    if color.space() != space:
+        # Treat undefined channels as zero
+        coords = alg.no_nans(color.coords())
+        for step in get_plan(type(color), type(color._space), space):
+            coords = step(coords)
 
     else:
         # Nothing to convert, just pass values as is
         coords = color.coords()
 
     return coords
+
+
+def convert_many(color_cls: Type['Color'], coords: Iterable[VectorLike], current: str, space: str) -> List[Vector]:
+    """
+    Convert many sets of coordinates from the current color space to the specified space.
+
+    The conversion plan is looked up once for all of them, and matrix steps are applied to all the coordinates
+    in one tight loop. Results are the same as converting each color individually.
+    """
+
+    current = current.lower()
+    space = space.lower()
+    if current == space:
+        # Nothing to convert, just pass values as is
+        return [list(c) for c in coords]
+
+    # Treat undefined channels as zero
+    rows = [alg.no_nans(c) for c in coords]
+
+    obj = color_cls.CS_MAP.get(current)
+    if obj is None:
+        raise ValueError("'{}' is not a valid color space".format(current))
+
+    for step in get_plan(color_cls, obj, space):
+        if isinstance(step, Transform):
+            (a, b, c), (d, e, f), (g, h, i) = step.matrix
+            rows = [
+                [0 + a * x + b * y + c * z, 0 + d * x + e * y + f * z, 0 + g * x + h * y + i * z]
+                for x, y, z in rows
+            ]
+        else:
+            rows = [step(r) for r in rows]
+    return rows
@@ -2,7 +2,9 @@
 from .. import algebra as alg
 from .bounds import FLG_ANGLE, GamutBound
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, Optional, Any
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, Any, Iterable, List, Tuple, Dict, Hashable
 
 if TYPE_CHECKING:  # pragma: no cover
     from ..color import Color
@@ -69,3 +71,97 @@ class Fit(ABCMeta):
     @abstractmethod
     def fit(cls, color: 'Color', **kwargs: Any) -> None:
         """Get coordinates of the new gamut mapped color."""
+
+
+class FitCache:
+    """
+    Least recently used cache of gamut mapped coordinates.
+
+    Entries are keyed by the input color's space and coordinates, the fit method, and the target space.
+    The cache can be shared between threads. Clear it if fit plugins are registered or deregistered.
+    """
+
+    def __init__(self, size: int = 1024) -> None:
+        """Initialize."""
+
+        self.size = size
+        self.lock = Lock()
+        self.entries = OrderedDict()  # type: OrderedDict[Hashable, Tuple[float, ...]]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, ...]]:
+        """Get the cached coordinates."""
+
+        with self.lock:
+            coords = self.entries.get(key)
+            if coords is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return coords
+
+    def set(self, key: Hashable, coords: Tuple[float, ...]) -> None:
+        """Cache the coordinates."""
+
+        with self.lock:
+            self.entries[key] = coords
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clear the cache."""
+
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+
+        return len(self.entries)
+
+
+def fit_key(color: 'Color', space: str, method: Optional[str]) -> Hashable:
+    """Get the key that identifies fitting the color to the given space with the given method."""
+
+    # `NaN` never compares equal, so use `None` in its place.
+    coords = tuple(None if alg.is_nan(c) else c for c in color.coords())
+    return (type(color), color.space(), coords, space, method)
+
+
+def fit_colors(
+    colors: Iterable['Color'],
+    space: str,
+    *,
+    method: Optional[str] = None,
+    cache: Optional[FitCache] = None
+) -> List['Color']:
+    """
+    Fit a batch of colors to the gamut of the given space.
+
+    Returns new colors in the given space, equivalent to `color.convert(space, fit=method or True)`.
+    Each distinct color is only fitted once per batch, and results are looked up in, and added to,
+    the cache if one is provided.
+    """
+
+    space = space.lower()
+    fit = True if method is None else method  # type: Any
+    fitted = {}  # type: Dict[Hashable, Tuple[float, ...]]
+    results = []
+    for color in colors:
+        key = fit_key(color, space, method)
+        coords = fitted.get(key)
+        if coords is None:
+            if cache is not None:
+                coords = cache.get(key)
+            if coords is None:
+                coords = tuple(color.convert(space, fit=fit).coords())
+                if cache is not None:
+                    cache.set(key, coords)
+            fitted[key] = coords
+        results.append(color.new(space, coords, color.alpha))
+    return results
@@ -0,0 +1,172 @@
+"""
+Fit by reducing chroma in Oklch to the gamut boundary.
+
+For RGB color spaces, the boundary is found directly instead of searching for it.
+"""
+import math
+from ..gamut import Fit, clip_channels
+from .fit_css_color_4 import CssColor4
+from .. import algebra as alg
+from ..algebra import NaN
+from ..spaces.oklab import OKLAB_TO_LMS3, LMS_TO_XYZD65
+from ..spaces import srgb_linear, display_p3, rec2020, a98_rgb
+from ..types import Matrix, Vector
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..color import Color
+
+# LMS to linear RGB for RGB spaces whose gamut boundary can be found directly.
+# The transfer functions of these spaces map 0 to 0 and 1 to 1 and are monotonic,
+# so the boundary is the same in linear light.
+LMS_TO_LINEAR_RGB = {
+    'srgb': alg.matmul3x3(srgb_linear.XYZ_TO_RGB, LMS_TO_XYZD65),
+    'srgb-linear': alg.matmul3x3(srgb_linear.XYZ_TO_RGB, LMS_TO_XYZD65),
+    'display-p3': alg.matmul3x3(display_p3.XYZ_TO_RGB, LMS_TO_XYZD65),
+    'rec2020': alg.matmul3x3(rec2020.XYZ_TO_RGB, LMS_TO_XYZD65),
+    'a98-rgb': alg.matmul3x3(a98_rgb.XYZ_TO_RGB, LMS_TO_XYZD65)
+}  # type: Dict[str, Matrix]
+
+# Chroma precision of the boundary.
+EPSILON = 1e-12
+MAX_ITERATIONS = 50
+
+
+def channel_polynomials(lightness: float, hue: float, matrix: Matrix) -> Matrix:
+    """
+    Get the polynomials, in chroma, of each linear RGB channel at the given Oklch lightness and hue.
+
+    LMS ** 1/3 is linear in chroma, so, as LMS to linear RGB is linear, each channel is a cubic in chroma.
+    Coefficients are returned lowest degree first.
+    """
+
+    a = math.cos(math.radians(hue))
+    b = math.sin(math.radians(hue))
+    offsets = [row[0] * lightness for row in OKLAB_TO_LMS3]
+    slopes = [row[1] * a + row[2] * b for row in OKLAB_TO_LMS3]
+
+    terms = [
+        [o ** 3, 3 * o * o * s, 3 * o * s * s, s ** 3]
+        for o, s in zip(offsets, slopes)
+    ]
+    return [
+        [sum(row[j] * terms[j][k] for j in range(3)) for k in range(4)]
+        for row in matrix
+    ]
+
+
+def evaluate(coeffs: Vector, x: float) -> float:
+    """Evaluate the cubic."""
+
+    return ((coeffs[3] * x + coeffs[2]) * x + coeffs[1]) * x + coeffs[0]
+
+
+def derivative(coeffs: Vector, x: float) -> float:
+    """Evaluate the derivative of the cubic."""
+
+    return (3 * coeffs[3] * x + 2 * coeffs[2]) * x + coeffs[1]
+
+
+def find_root(coeffs: Vector, low: float, high: float, flow: float) -> float:
+    """
+    Find the root of the cubic in a span where it is monotonic and changes sign.
+
+    Newton's method is used, falling back to bisection whenever a step would leave the span.
+    The low end of the final span is returned, so the value never crosses the root.
+    """
+
+    x = (low + high) * 0.5
+    for _ in range(MAX_ITERATIONS):
+        fx = evaluate(coeffs, x)
+        if (fx < 0) == (flow < 0):
+            low = x
+        else:
+            high = x
+        if high - low < EPSILON:
+            break
+        d = derivative(coeffs, x)
+        step = x - fx / d if d else low
+        x = step if low < step < high else (low + high) * 0.5
+    return low
+
+
+def first_root(coeffs: Vector, high: float) -> Optional[float]:
+    """Find the first root of the cubic in (0, high], if there is one."""
+
+    # Split the range where the derivative is zero so that each span is monotonic.
+    a = 3 * coeffs[3]
+    b = 2 * coeffs[2]
+    c = coeffs[1]
+    points = []
+    if a:
+        disc = b * b - 4 * a * c
+        if disc >= 0:
+            r = math.sqrt(disc)
+            points.extend(((-b - r) / (2 * a), (-b + r) / (2 * a)))
+    elif b:
+        points.append(-c / b)
+
+    low = 0.0
+    flow = coeffs[0]
+    for x in sorted(p for p in points if 0 < p < high) + [high]:
+        fx = evaluate(coeffs, x)
+        if fx == 0:
+            return x
+        if (fx < 0) != (flow < 0):
+            return find_root(coeffs, low, x, flow)
+        low = x
+        flow = fx
+    return None
+
+
+def max_chroma(lightness: float, chroma: float, hue: float, matrix: Matrix) -> float:
+    """Get the largest chroma, up to the given chroma, that is within the RGB gamut at the given lightness and hue."""
+
+    for coeffs in channel_polynomials(lightness, hue, matrix):
+        for edge in (0.0, 1.0):
+            shifted = [coeffs[0] - edge] + coeffs[1:]
+            root = first_root(shifted, chroma)
+            if root is not None:
+                chroma = root
+    return chroma
+
+
+class OklchBoundary(Fit):
+    """
+    Oklch chroma gamut mapping class that reduces chroma to the gamut boundary.
+
+    Lightness and hue are preserved, and chroma is reduced to the largest chroma that is in gamut.
+    For RGB spaces, the boundary is solved for directly: each linear RGB channel is a cubic in chroma,
+    so the boundary is the first root of any channel at 0 or 1. Other spaces fall back to the CSS Color
+    Level 4 algorithm.
+    """
+
+    NAME = "oklch-boundary"
+    SPACE = "oklch"
+    MIN_LIGHTNESS = 0
+    MAX_LIGHTNESS = 1
+
+    @classmethod
+    def fit(cls, color: 'Color', **kwargs: Any) -> None:
+        """Gamut mapping via Oklch chroma."""
+
+        space = color._space.GAMUT_CHECK or color.space()
+        matrix = LMS_TO_LINEAR_RGB.get(space)
+        if matrix is None:
+            CssColor4.fit(color, **kwargs)
+            return
+
+        mapcolor = color.convert(cls.SPACE)
+        lightness = mapcolor.lightness
+
+        # Return white or black if lightness is out of range
+        if lightness >= cls.MAX_LIGHTNESS or lightness <= cls.MIN_LIGHTNESS:
+            mapcolor.chroma = 0
+            mapcolor.hue = NaN
+            clip_channels(color.update(mapcolor))
+            return
+
+        mapcolor.chroma = max_chroma(lightness, mapcolor.chroma, alg.no_nan(mapcolor.hue), matrix)
+
+        # Clean up any floating point error at the boundary.
+        clip_channels(color.update(mapcolor))
@@ -0,0 +1,118 @@
+"""
+Match colors.
+
+Matching tries the `color()` syntax and then every color space's `match` in turn. When scanning text, most attempts
+fail, so the patterns that color spaces use to match are combined into a single pattern with a named group per color
+space. One attempt of the combined pattern tells us which color space, if any, can match, and only that color space's
+`match` needs to be called.
+"""
+import re
+from .css import parse
+from .spaces import Space
+from typing import Optional, Tuple, Type, Dict, List, Pattern, Iterable, cast
+
+RE_GLOBAL_FLAGS = re.compile(r'^\(\?[aiLmsux]+\)')
+
+
+def get_match_pattern(space: Type[Space]) -> Tuple[bool, Optional[Pattern[str]]]:
+    """
+    Get whether the color space can match anything, and the pattern it uses to match, if known.
+
+    A pattern is only used if it is defined by the same class that defines `match`,
+    as a subclass may override `match` without providing its pattern.
+    """
+
+    for klass in space.__mro__:  # pragma: no branch
+        if 'match' in vars(klass):
+            if klass is Space:
+                # The base color space doesn't match anything.
+                return False, None
+            return True, vars(klass).get('MATCH_PATTERN')
+    return True, None  # pragma: no cover
+
+
+def combine_patterns(patterns: List[Pattern[str]], flags: int) -> Pattern[str]:
+    """Combine the patterns into one pattern with a named group for each pattern."""
+
+    parts = []
+    for i, pattern in enumerate(patterns):
+        source = RE_GLOBAL_FLAGS.sub('', pattern.pattern)
+        # Verbose patterns may end in a comment, so make sure the group is not commented out.
+        parts.append('(?P<_m{}>{}{})'.format(i, source, '\n' if flags & re.X else ''))
+    return re.compile('|'.join(parts), flags)
+
+
+class Matcher:
+    """
+    Match colors in the given color spaces.
+
+    Resolves which color spaces participate, and in what order, once. Consecutive color spaces
+    whose patterns are known and use the same flags are combined, everything else is tried individually.
+    """
+
+    def __init__(self, spaces: Dict[str, Type[Space]], filters: Iterable[str]) -> None:
+        """Initialize."""
+
+        self.spaces = spaces
+        self.filters = frozenset(filters)
+        self.steps = []  # type: List[Tuple[Optional[Pattern[str]], List[Type[Space]]]]
+
+        group = []  # type: List[Tuple[Pattern[str], Type[Space]]]
+        flags = None  # type: Optional[int]
+        for name, space in spaces.items():
+            if self.filters and name not in self.filters:
+                continue
+            matches, pattern = get_match_pattern(space)
+            if not matches:
+                continue
+            if pattern is not None and pattern.flags == flags:
+                group.append((pattern, space))
+                continue
+            self._add_step(group, flags)
+            group = []
+            flags = None
+            if pattern is None:
+                self.steps.append((None, [space]))
+            else:
+                group.append((pattern, space))
+                flags = pattern.flags
+        self._add_step(group, flags)
+
+    def _add_step(self, group: List[Tuple[Pattern[str], Type[Space]]], flags: Optional[int]) -> None:
+        """Add a step for a group of color spaces whose patterns can be combined."""
+
+        if not group:
+            return
+        try:
+            pattern = combine_patterns([p for p, s in group], flags if flags is not None else 0)
+        except re.error:  # pragma: no cover
+            # The patterns can't be combined (conflicting group names, etc.), so just try them individually.
+            for p, space in group:
+                self.steps.append((None, [space]))
+        else:
+            self.steps.append((pattern, [s for p, s in group]))
+
+    def match(self, string: str, start: int = 0, fullmatch: bool = False) -> Optional[Tuple[Space, int, int]]:
+        """Match a color and return the color space object along with the start and end of the match."""
+
+        # Attempt color match
+        m = parse.parse_color(string, self.spaces, start, fullmatch)
+        if m is not None:
+            if not self.filters or m[0].NAME in self.filters:
+                return m[0](*m[1]), start, m[2]
+            return None
+
+        # Attempt color space specific match
+        for pattern, spaces in self.steps:
+            if pattern is not None:
+                m2 = pattern.match(string, start)
+                if m2 is None:
+                    continue
+                # Only the matched color space, or any after it in this step, can match.
+                spaces = spaces[int(cast(str, m2.lastgroup)[2:]):]
+
+            for space in spaces:
+                m3 = space.match(string, start, fullmatch)
+                if m3 is not None:
+                    return space(*m3[0]), start, m3[1]
+        return None
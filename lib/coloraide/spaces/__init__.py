@@ -117,8 +117,17 @@ class Space(
     EXTENDED_RANGE = False
     # Bounds of channels. Range could be suggested or absolute as not all spaces have definitive ranges.
     BOUNDS = tuple()  # type: Tuple[Bounds, ...]
+    # Compiled pattern used by `match` to find the color space's format, if it uses one. Matchers can combine these
+    # patterns to quickly find which color space, if any, can match at a given position. A pattern only applies to the
+    # `match` method defined in the same class.
+    MATCH_PATTERN = None  # type: Any
     # White point
     WHITE = (0.0, 0.0)
+    # Steps that are equivalent to `to_base` and `from_base`, applied in order: functions of the coordinates (such as
+    # transfer functions) or 3x3 matrices. When converting, consecutive matrices, even across color spaces, are combined
+    # into one. Steps only apply to the `to_base` or `from_base` method defined in the same class.
+    TO_BASE_STEPS = None  # type: Optional[Tuple[Any, ...]]
+    FROM_BASE_STEPS = None  # type: Optional[Tuple[Any, ...]]
 
     def __init__(self, color: Union['Space', VectorLike], alpha: Optional[float] = None) -> None:
         """Initialize."""
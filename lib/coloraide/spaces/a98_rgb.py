@@ -3,7 +3,6 @@ from ..cat import WHITES
 from .srgb import SRGB
 from .. import algebra as alg
 from ..types import Vector
-from typing import cast
 
 RGB_TO_XYZ = [
     [0.5766690429101305, 0.1855582379065463, 0.1882286462349947],
@@ -28,13 +27,13 @@ def lin_a98rgb_to_xyz(rgb: Vector) -> Vector:
     https://www.adobe.com/digitalimag/pdfs/AdobeRGB1998.pdf
     """
 
-    return cast(Vector, alg.dot(RGB_TO_XYZ, rgb, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(RGB_TO_XYZ, rgb)
 
 
 def xyz_to_lin_a98rgb(xyz: Vector) -> Vector:
     """Convert XYZ to linear-light a98-rgb."""
 
-    return cast(Vector, alg.dot(XYZ_TO_RGB, xyz, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(XYZ_TO_RGB, xyz)
 
 
 def lin_a98rgb(rgb: Vector) -> Vector:
@@ -55,6 +54,8 @@ class A98RGB(SRGB):
     BASE = "xyz-d65"
     NAME = "a98-rgb"
     WHITE = WHITES['2deg']['D65']
+    TO_BASE_STEPS = (lin_a98rgb, RGB_TO_XYZ)
+    FROM_BASE_STEPS = (XYZ_TO_RGB, gam_a98rgb)
 
     @classmethod
     def to_base(cls, coords: Vector) -> Vector:
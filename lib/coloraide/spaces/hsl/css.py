@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class HSL(base.HSL):
     """HSL class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['hsl']
+
     def to_string(
         self,
         parent: 'Color',
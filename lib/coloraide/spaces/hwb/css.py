@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class HWB(base.HWB):
     """HWB class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['hwb']
+
     def to_string(
         self,
         parent: 'Color',
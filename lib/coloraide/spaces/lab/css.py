@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class Lab(base.Lab):
     """Lab class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['lab']
+
     def to_string(
         self,
         parent: 'Color',
@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class Lch(base.Lch):
     """Lch class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['lch']
+
     def to_string(
         self,
         parent: 'Color',
@@ -30,7 +30,6 @@ from ...cat import WHITES
 from ...gamut.bounds import GamutUnbound, FLG_OPT_PERCENT
 from ... import algebra as alg
 from ...types import Vector
-from typing import cast
 
 # sRGB Linear to LMS
 SRGBL_TO_LMS = [
@@ -78,52 +77,36 @@ LMS_TO_XYZD65 = [
 def oklab_to_linear_srgb(lab: Vector) -> Vector:
     """Convert from Oklab to linear sRGB."""
 
-    return cast(
-        Vector,
-        alg.dot(
-            LMS_TO_SRGBL,
-            [c ** 3 for c in cast(Vector, alg.dot(OKLAB_TO_LMS3, lab, dims=alg.D2_D1))],
-            dims=alg.D2_D1
-        )
+    return alg.matmul3x3_vec3(
+        LMS_TO_SRGBL,
+        [c ** 3 for c in alg.matmul3x3_vec3(OKLAB_TO_LMS3, lab)]
     )
 
 
 def linear_srgb_to_oklab(rgb: Vector) -> Vector:  # pragma: no cover
     """Linear sRGB to Oklab."""
 
-    return cast(
-        Vector,
-        alg.dot(
-            LMS3_TO_OKLAB,
-            [alg.cbrt(c) for c in cast(Vector, alg.dot(SRGBL_TO_LMS, rgb, dims=alg.D2_D1))],
-            dims=alg.D2_D1
-        )
+    return alg.matmul3x3_vec3(
+        LMS3_TO_OKLAB,
+        [alg.cbrt(c) for c in alg.matmul3x3_vec3(SRGBL_TO_LMS, rgb)]
     )
 
 
 def oklab_to_xyz_d65(lab: Vector) -> Vector:
     """Convert from Oklab to XYZ D65."""
 
-    return cast(
-        Vector,
-        alg.dot(
-            LMS_TO_XYZD65,
-            [c ** 3 for c in cast(Vector, alg.dot(OKLAB_TO_LMS3, lab, dims=alg.D2_D1))],
-            dims=alg.D2_D1
-        )
+    return alg.matmul3x3_vec3(
+        LMS_TO_XYZD65,
+        [c ** 3 for c in alg.matmul3x3_vec3(OKLAB_TO_LMS3, lab)]
     )
 
 
 def xyz_d65_to_oklab(xyz: Vector) -> Vector:
     """XYZ D65 to Oklab."""
 
-    return cast(
-        Vector,
-        alg.dot(
-            LMS3_TO_OKLAB,
-            [alg.cbrt(c) for c in cast(Vector, alg.dot(XYZD65_TO_LMS, xyz, dims=alg.D2_D1))],
-            dims=alg.D2_D1
-        )
+    return alg.matmul3x3_vec3(
+        LMS3_TO_OKLAB,
+        [alg.cbrt(c) for c in alg.matmul3x3_vec3(XYZD65_TO_LMS, xyz)]
     )
 
 
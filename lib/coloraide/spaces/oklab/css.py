@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class Oklab(base.Oklab):
     """Oklab class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['oklab']
+
     def to_string(
         self,
         parent: 'Color',
@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class Oklch(base.Oklch):
     """Oklch class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['oklch']
+
     def to_string(
         self,
         parent: 'Color',
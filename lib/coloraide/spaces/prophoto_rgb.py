@@ -3,7 +3,6 @@ from ..cat import WHITES
 from .srgb import SRGB
 from .. import algebra as alg
 from ..types import Vector
-from typing import cast
 
 ET = 1 / 512
 ET2 = 16 / 512
@@ -29,13 +28,13 @@ def lin_prophoto_to_xyz(rgb: Vector) -> Vector:
     http://www.brucelindbloom.com/index.html?Eqn_RGB_XYZ_Matrix.html
     """
 
-    return cast(Vector, alg.dot(RGB_TO_XYZ, rgb, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(RGB_TO_XYZ, rgb)
 
 
 def xyz_to_lin_prophoto(xyz: Vector) -> Vector:
     """Convert XYZ to linear-light prophoto-rgb."""
 
-    return cast(Vector, alg.dot(XYZ_TO_RGB, xyz, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(XYZ_TO_RGB, xyz)
 
 
 def lin_prophoto(rgb: Vector) -> Vector:
@@ -82,6 +81,8 @@ class ProPhotoRGB(SRGB):
     BASE = "xyz-d50"
     NAME = "prophoto-rgb"
     WHITE = WHITES['2deg']['D50']
+    TO_BASE_STEPS = (lin_prophoto, RGB_TO_XYZ)
+    FROM_BASE_STEPS = (XYZ_TO_RGB, gam_prophoto)
 
     @classmethod
     def to_base(cls, coords: Vector) -> Vector:
@@ -4,7 +4,6 @@ from .srgb import SRGB
 import math
 from .. import algebra as alg
 from ..types import Vector
-from typing import cast
 
 ALPHA = 1.09929682680944
 BETA = 0.018053968510807
@@ -67,13 +66,13 @@ def lin_2020_to_xyz(rgb: Vector) -> Vector:
     http://www.brucelindbloom.com/index.html?Eqn_RGB_XYZ_Matrix.html
     """
 
-    return cast(Vector, alg.dot(RGB_TO_XYZ, rgb, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(RGB_TO_XYZ, rgb)
 
 
 def xyz_to_lin_2020(xyz: Vector) -> Vector:
     """Convert XYZ to linear-light rec-2020."""
 
-    return cast(Vector, alg.dot(XYZ_TO_RGB, xyz, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(XYZ_TO_RGB, xyz)
 
 
 class Rec2020(SRGB):
@@ -82,6 +81,8 @@ class Rec2020(SRGB):
     BASE = "xyz-d65"
     NAME = "rec2020"
     WHITE = WHITES['2deg']['D65']
+    TO_BASE_STEPS = (lin_2020, RGB_TO_XYZ)
+    FROM_BASE_STEPS = (XYZ_TO_RGB, gam_2020)
 
     @classmethod
     def to_base(cls, coords: Vector) -> Vector:
@@ -12,6 +12,8 @@ if TYPE_CHECKING:  # pragma: no cover
 class SRGB(base.SRGB):
     """SRGB class."""
 
+    MATCH_PATTERN = parse.CSS_MATCH['srgb']
+
     def to_string(
         self,
         parent: 'Color',
@@ -3,7 +3,6 @@ from ..cat import WHITES
 from .srgb import SRGB
 from .. import algebra as alg
 from ..types import Vector
-from typing import cast
 
 
 RGB_TO_XYZ = [
@@ -26,13 +25,13 @@ def lin_srgb_to_xyz(rgb: Vector) -> Vector:
     D65 (no chromatic adaptation)
     """
 
-    return cast(Vector, alg.dot(RGB_TO_XYZ, rgb, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(RGB_TO_XYZ, rgb)
 
 
 def xyz_to_lin_srgb(xyz: Vector) -> Vector:
     """Convert XYZ to linear-light sRGB."""
 
-    return cast(Vector, alg.dot(XYZ_TO_RGB, xyz, dims=alg.D2_D1))
+    return alg.matmul3x3_vec3(XYZ_TO_RGB, xyz)
 
 
 class SRGBLinear(SRGB):
@@ -42,6 +41,8 @@ class SRGBLinear(SRGB):
     NAME = "srgb-linear"
     SERIALIZE = ("srgb-linear",)
     WHITE = WHITES['2deg']['D65']
+    TO_BASE_STEPS = (RGB_TO_XYZ,)
+    FROM_BASE_STEPS = (XYZ_TO_RGB,)
 
     @classmethod
     def to_base(cls, coords: Vector) -> Vector:
@@ -14,6 +14,8 @@ class XYZD65(Space):
     SERIALIZE = ("xyz-d65", 'xyz')  # type: Tuple[str, ...]
     CHANNEL_NAMES = ("x", "y", "z")
     WHITE = WHITES['2deg']['D65']
+    TO_BASE_STEPS = ()
+    FROM_BASE_STEPS = ()
 
     BOUNDS = (
         GamutUnbound(0.0, 1.0),
@@ -1,5 +1,5 @@
 """Typing."""
-from typing import Union, Any, Mapping, Sequence, List, TypeVar, TYPE_CHECKING
+from typing import Union, Any, Mapping, Sequence, List, TypeVar, Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from .color import Color
@@ -13,5 +13,7 @@ Array = Union[Matrix, Vector]
 VectorLike = Sequence[float]
 MatrixLike = Sequence[VectorLike]
 ArrayLike = Union[VectorLike, MatrixLike]
+# A conversion step: either a function of the coordinates or a 3x3 matrix
+ConvertStep = Union[Callable[[Vector], Vector], Matrix]
 # For times when we must explicitly say we support `int` and `float`
 SupportsFloatOrInt = TypeVar('SupportsFloatOrInt', float, int)
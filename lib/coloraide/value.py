@@ -0,0 +1,102 @@
+"""
+Lightweight color values.
+
+`Color` validates and dispatches every channel access through its color space object. Code that creates,
+adjusts, and converts many colors in a loop can use `ColorValue` instead: a color space name, three channels,
+and alpha as plain attributes, which can be converted in batches and turned into a `Color` when needed.
+"""
+from . import convert
+from .types import Vector
+from typing import TYPE_CHECKING, Iterable, List, Type
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .color import Color
+
+
+class ColorValue:
+    """A color space name, three channel values, and alpha."""
+
+    __slots__ = ('space', 'c0', 'c1', 'c2', 'alpha')
+
+    def __init__(self, space: str, c0: float, c1: float, c2: float, alpha: float = 1.0) -> None:
+        """Initialize."""
+
+        self.space = space
+        self.c0 = c0
+        self.c1 = c1
+        self.c2 = c2
+        self.alpha = alpha
+
+    @classmethod
+    def from_color(cls, color: 'Color') -> 'ColorValue':
+        """Create a value from a color in a color space with three channels."""
+
+        coords = color.coords()
+        if len(coords) != 3:
+            raise ValueError("'{}' does not have three channels".format(color.space()))
+        return cls(color.space(), coords[0], coords[1], coords[2], color.alpha)
+
+    def to_color(self, color_cls: Type['Color']) -> 'Color':
+        """Create a color of the given color class from the value."""
+
+        return color_cls(self.space, [self.c0, self.c1, self.c2], self.alpha)
+
+    def coords(self) -> Vector:
+        """Get the channel values."""
+
+        return [self.c0, self.c1, self.c2]
+
+    def clone(self) -> 'ColorValue':
+        """Clone."""
+
+        return ColorValue(self.space, self.c0, self.c1, self.c2, self.alpha)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare equal."""
+
+        return (
+            isinstance(other, ColorValue) and
+            (self.space, self.c0, self.c1, self.c2, self.alpha) ==
+            (other.space, other.c0, other.c1, other.c2, other.alpha)
+        )
+
+    def __repr__(self) -> str:
+        """Representation."""
+
+        return 'ColorValue({!r}, {!r}, {!r}, {!r}, {!r})'.format(self.space, self.c0, self.c1, self.c2, self.alpha)
+
+
+def channel_attr(color_cls: Type['Color'], space: str, name: str) -> str:
+    """Get the `ColorValue` attribute that holds a color space's channel, given the channel's name or alias."""
+
+    if name == 'alpha':
+        return 'alpha'
+    cs = color_cls.CS_MAP[space]
+    return 'c{}'.format(cs.CHANNEL_NAMES.index(cs.CHANNEL_ALIASES.get(name, name)))
+
+
+def convert_values(color_cls: Type['Color'], values: Iterable[ColorValue], space: str) -> List[ColorValue]:
+    """
+    Convert the values to the specified space using the color class's color spaces.
+
+    Runs of values in the same color space are converted together.
+    """
+
+    space = space.lower()
+    results = []  # type: List[ColorValue]
+    run = []  # type: List[ColorValue]
+    for value in values:
+        if run and value.space != run[0].space:
+            results.extend(convert_run(color_cls, run, space))
+            run = []
+        run.append(value)
+    if run:
+        results.extend(convert_run(color_cls, run, space))
+    return results
+
+
+def convert_run(color_cls: Type['Color'], run: List[ColorValue], space: str) -> List[ColorValue]:
+    """Convert values that are all in the same color space."""
+
+    coords = convert.convert_many(color_cls, [v.coords() for v in run], run[0].space, space)
+    return [ColorValue(space, c[0], c[1], c[2], v.alpha) for c, v in zip(coords, run)]
@@ -7,7 +7,11 @@ Copyright (c) 2015 - 2020 Isaac Muse <isaacmuse@gmail.com>
 from mdpopups.png import Writer
 from .coloraide import Color
 from .coloraide import algebra as alg
+from collections import OrderedDict, namedtuple
+from abc import ABCMeta, abstractmethod
+import threading
 import base64
+import struct
 import io
 
 CHECK_LIGHT = Color("#FFFFFF")
@@ -25,19 +29,124 @@ LEFT = 8
 X = 0
 Y = 1
 
-__all__ = ('color_box',)
+__all__ = (
+    'color_box', 'clear_cache', 'cache_info', 'set_png_mode',
+    'SwatchBackend', 'register_backend', 'set_backend'
+)
 
 BIT_DEPTH = 16
 MAX_VALUE = 2 ** BIT_DEPTH - 1
 
+# How swatch PNGs are encoded.
+PNG_RGB16 = 'rgb16'
+PNG_RGB8 = 'rgb8'
+PNG_PALETTE = 'palette'
+PNG_MODES = (PNG_RGB16, PNG_RGB8, PNG_PALETTE)
+MAX_PALETTE = 256
 
-def process_channel(c):
+CACHE_SIZE = 1024
+
+
+class CacheInfo(namedtuple('CacheInfo', ['hits', 'misses', 'size', 'maxsize'])):
+    """Cache info."""
+
+
+class SwatchCache:
+    """
+    Least recently used cache of encoded swatches.
+
+    Swatches are keyed by their rendering inputs. The same colors tend to show up
+    over and over in a file, so there is no reason to render them more than once.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        """Initialize."""
+
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Get a swatch, or `None` if it is not cached."""
+
+        with self.lock:
+            value = self.cache.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.cache.move_to_end(key)
+            return value
+
+    def set(self, key, value):  # noqa: A003
+        """Cache a swatch, evicting the least recently used if the cache is full."""
+
+        with self.lock:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+
+    def clear(self):
+        """Clear the cache and reset the counters."""
+
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Get cache info."""
+
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, len(self.cache), self.maxsize)
+
+
+swatch_cache = SwatchCache()
+check_colors = {}
+png_mode = PNG_PALETTE
+
+
+def clear_cache():
+    """Clear the swatch cache."""
+
+    swatch_cache.clear()
+
+
+def cache_info():
+    """Get swatch cache info."""
+
+    return swatch_cache.info()
+
+
+def set_png_mode(mode):
+    """
+    Set how swatches are encoded.
+
+    `rgb16` and `rgb8` write 16 or 8 bit RGB(A) images, and `palette` writes 8 bit
+    color mapped images, falling back to `rgb8` if a swatch has too many colors.
+    """
+
+    global png_mode
+
+    png_mode = mode if mode in PNG_MODES else PNG_PALETTE
+
+
+def color_key(color):
+    """Get a hashable key for a color."""
+
+    return (color.space(), tuple(alg.no_nans(color.coords())), alg.no_nan(color.alpha))
+
+
+def process_channel(c, max_value=MAX_VALUE):
     """Process channel."""
 
-    return max(min(int(alg.round_half_up(c * MAX_VALUE)), MAX_VALUE), 0)
+    return max(min(int(alg.round_half_up(c * max_value)), max_value), 0)
 
 
-def to_list(rgb, alpha=False):
+def to_list(rgb, alpha=False, max_value=MAX_VALUE):
     """
     Break RGB channel into a list.
 
@@ -45,9 +154,9 @@ def to_list(rgb, alpha=False):
     and convert to a list with format `[r, g, b]`.
     """
 
-    r, g, b = [process_channel(c) for c in rgb.coords()]
+    r, g, b = [process_channel(c, max_value) for c in rgb.coords()]
     if alpha:
-        a = process_channel(rgb.alpha)
+        a = process_channel(rgb.alpha, max_value)
         return [r, g, b, a]
     else:
         return [r, g, b]
@@ -56,10 +165,24 @@ def to_list(rgb, alpha=False):
 def checkered_color(color, background):
     """Mix color with the checkered color."""
 
+    if alg.no_nan(color.alpha) == 1:
+        # An opaque color completely hides the checkered color.
+        return Color(color.space(), alg.no_nans(color.coords()))
+
     checkered = Color(color)
     return checkered.compose(background, space=checkered.space(), out_space=checkered.space())
 
 
+def get_check_colors(gamut_space):
+    """Get the checkered and transparent colors for the gamut space."""
+
+    colors = check_colors.get(gamut_space)
+    if colors is None:
+        colors = (CHECK_LIGHT.convert(gamut_space), CHECK_DARK.convert(gamut_space), TRANSPARENT.convert(gamut_space))
+        check_colors[gamut_space] = colors
+    return colors
+
+
 def get_border_size(direction, border_map):
     """Get size of border map."""
 
@@ -77,10 +200,32 @@ def get_border_size(direction, border_map):
     return size
 
 
+def get_border_sizes(border_size, double):
+    """Get the size of the outer and inner border."""
+
+    border1_size = border2_size = int(border_size / 2)
+    border1_size += border_size % 2
+    if not double:
+        border1_size += border2_size
+        border2_size = 0
+    return border1_size, border2_size
+
+
+def get_dividers(color_width, count):
+    """Get the width of each color when showing multiple colors."""
+
+    if not count:
+        return 0
+    dividers = int(color_width / count)
+    if color_width % count:
+        dividers += 1
+    return dividers
+
+
 def color_box_raw(
     colors, border=None, border2=None, height=32, width=32,
     border_size=1, check_size=4, max_colors=5, alpha=False, border_map=0xF,
-    gamut_space='srgb'
+    gamut_space='srgb', mode=None
 ):
     """
     Generate palette preview.
@@ -97,13 +242,17 @@ def color_box_raw(
     horizontally only.
 
     Define size of swatch, border width,  and size of checkerboard squares.
+
+    The PNG is encoded with the given mode, or the mode set with `set_png_mode`.
     """
 
     assert height - (border_size * 2) >= 0, "Border size too big!"
     assert width - (border_size * 2) >= 0, "Border size too big!"
-    check_light = CHECK_LIGHT.convert(gamut_space)
-    check_dark = CHECK_DARK.convert(gamut_space)
-    transparent = TRANSPARENT.convert(gamut_space)
+    check_light, check_dark, transparent = get_check_colors(gamut_space)
+    if mode is None:
+        mode = png_mode
+    bit_depth = BIT_DEPTH if mode == PNG_RGB16 else 8
+    max_value = 2 ** bit_depth - 1
 
     if border is None:
         border = Color(gamut_space, [1, 1, 1])
@@ -112,141 +261,135 @@ def color_box_raw(
     preview_colors = []
     count = max_colors if len(colors) >= max_colors else len(colors)
 
-    border = to_list(border, False)
+    border = to_list(border, False, max_value)
     if border2 is not None:
-        border2 = to_list(border2, False)
+        border2 = to_list(border2, False, max_value)
 
-    border1_size = border2_size = int(border_size / 2)
-    border1_size += border_size % 2
-    if border2 is None:
-        border1_size += border2_size
-        border2_size = 0
+    border1_size, border2_size = get_border_sizes(border_size, border2 is not None)
 
     if count:
         for c in range(0, count):
             if alpha:
                 preview_colors.append(
                     (
-                        to_list(colors[c], True),
-                        to_list(colors[c], True)
+                        to_list(colors[c], True, max_value),
+                        to_list(colors[c], True, max_value)
                     )
                 )
             else:
                 preview_colors.append(
                     (
-                        to_list(checkered_color(colors[c], check_light)),
-                        to_list(checkered_color(colors[c], check_dark))
+                        to_list(checkered_color(colors[c], check_light), False, max_value),
+                        to_list(checkered_color(colors[c], check_dark), False, max_value)
                     )
                 )
     else:
         if alpha:
             preview_colors.append(
-                (to_list(transparent), to_list(transparent))
+                (to_list(transparent, True, max_value), to_list(transparent, True, max_value))
             )
         else:
             preview_colors.append(
-                (to_list(check_light), to_list(check_dark))
+                (to_list(check_light, False, max_value), to_list(check_dark, False, max_value))
             )
 
     color_height = height - (border_size * get_border_size(Y, border_map))
     color_width = width - (border_size * get_border_size(X, border_map))
+    dividers = get_dividers(color_width, count)
 
-    if count:
-        dividers = int(color_width / count)
-        if color_width % count:
-            dividers += 1
+    # Borders are always opaque.
+    if alpha:
+        border.append(max_value)
+        if border2 is not None:
+            border2.append(max_value)
+
+    # A swatch only has a handful of distinct colors, so they usually fit in a palette.
+    palette = None
+    if mode == PNG_PALETTE:
+        pixels = [border] if border2 is None else [border, border2]
+        for light, dark in preview_colors:
+            pixels.extend((light, dark))
+        palette = list(OrderedDict.fromkeys(tuple(pixel) for pixel in pixels))
+        if len(palette) > MAX_PALETTE:
+            palette = None
+
+    # Pack the pixels once, rows are then assembled from the packed pixels.
+    if palette is not None:
+        lookup = {pixel: i for i, pixel in enumerate(palette)}
+
+        def pack(pixel):
+            """Pack the pixel as its palette index."""
+
+            return bytes([lookup[tuple(pixel)]])
+    elif bit_depth == 8:
+        pack = bytes
     else:
-        dividers = 0
-
-    color_size_x = color_width
+        fmt = '>{}H'.format(4 if alpha else 3)
+
+        def pack(pixel):
+            """Pack the pixel as 16 bit big endian values."""
+
+            return struct.pack(fmt, *pixel)
+
+    border = pack(border)
+    border2 = pack(border2) if border2 is not None else b''
+    preview_colors = [(pack(light), pack(dark)) for light, dark in preview_colors]
+
+    left = right = b''
+    if border_map & LEFT:
+        left = border * border1_size + border2 * border2_size
+    if border_map & RIGHT:
+        right = border2 * border2_size + border * border1_size
+
+    # The checkerboard only has two row patterns: one where the first square is light, and one where it is dark.
+    # Build each once, along with the border rows, and repeat them by reference.
+    check_rows = []
+    for check_color_y in (LIGHT, DARK):
+        parts = [left]
+        x = 0
+        while x < color_width:
+            # Each run of pixels ends at the next check square or color division.
+            end = min(color_width, (x // check_size + 1) * check_size)
+            index = 0
+            if dividers:
+                index = x // dividers
+                end = min(end, (index + 1) * dividers)
+            check_color_x = check_color_y ^ ((x // check_size + 1) & 1)
+            parts.append((preview_colors[index][1] if check_color_x == DARK else preview_colors[index][0]) * (end - x))
+            x = end
+        parts.append(right)
+        check_rows.append(b''.join(parts))
+
+    border1_row = border * width
+    border2_row = left + border2 * color_width + right
 
     p = []
 
     # Top Border
     if border_map & TOP:
-        for x in range(0, border1_size):
-            row = list(border * width)
-            p.append(row)
-        for x in range(0, border2_size):
-            row = []
-            if border_map & LEFT and border_map & RIGHT:
-                row += list(border * border1_size)
-                row += list(border2 * border2_size)
-                row += list(border2 * color_width)
-                row += list(border2 * border2_size)
-                row += list(border * border1_size)
-            elif border_map & RIGHT:
-                row += list(border2 * color_width)
-                row += list(border2 * border2_size)
-                row += list(border * border1_size)
-            elif border_map & LEFT:
-                row += list(border * border1_size)
-                row += list(border2 * border2_size)
-                row += list(border2 * color_width)
-            else:
-                row += list(border2 * color_width)
-            p.append(row)
+        p.extend([border1_row] * border1_size)
+        p.extend([border2_row] * border2_size)
 
     check_color_y = DARK
     for y in range(0, color_height):
-        index = 0
         if y % check_size == 0:
             check_color_y = DARK if check_color_y == LIGHT else LIGHT
+        p.append(check_rows[check_color_y])
 
-        # Left border
-        row = []
-        if border_map & LEFT:
-            row += list(border * border1_size)
-            if border2:
-                row += list(border2 * border2_size)
-
-        check_color_x = check_color_y
-        for x in range(0, color_size_x):
-            if x != 0 and dividers != 0 and x % dividers == 0:
-                index += 1
-            if x % check_size == 0:
-                check_color_x = DARK if check_color_x == LIGHT else LIGHT
-            row += (preview_colors[index][1] if check_color_x == DARK else preview_colors[index][0])
-
-        if border_map & RIGHT:
-            # Right border
-            if border2:
-                row += list(border2 * border2_size)
-            row += list(border * border1_size)
-
-        p.append(row)
-
+    # Bottom border
     if border_map & BOTTOM:
-        # Bottom border
-        for x in range(0, border2_size):
-            row = []
-            if border_map & LEFT and border_map & RIGHT:
-                row += list(border * border1_size)
-                row += list(border2 * border2_size)
-                row += list(border2 * color_width)
-                row += list(border2 * border2_size)
-                row += list(border * border1_size)
-            elif border_map & LEFT:
-                row += list(border * border1_size)
-                row += list(border2 * border2_size)
-                row += list(border2 * color_width)
-            elif border_map & RIGHT:
-                row += list(border2 * color_width)
-                row += list(border2 * border2_size)
-                row += list(border * border1_size)
-            else:
-                row += list(border2 * color_width)
-            p.append(row)
-        for x in range(0, border1_size):
-            row = list(border * width)
-            p.append(row)
+        p.extend([border2_row] * border2_size)
+        p.extend([border1_row] * border1_size)
 
     # Create bytes buffer for PNG
     with io.BytesIO() as f:
 
         # Write out PNG
-        img = Writer(width, height, alpha=alpha, bitdepth=BIT_DEPTH)
-        img.write(f, p)
+        if palette is not None:
+            img = Writer(width, height, palette=palette, bitdepth=8)
+        else:
+            img = Writer(width, height, alpha=alpha, bitdepth=bit_depth)
+        img.write_packed(f, p)
 
         # Read out PNG bytes and base64 encode
         f.seek(0)
@@ -254,9 +397,172 @@ def color_box_raw(
         return f.read()
 
 
-def color_box(*args, **kwargs):
-    """Generate palette preview and base64 encode it."""
+class SwatchBackend(metaclass=ABCMeta):
+    """
+    Swatch backend.
+
+    A backend renders a swatch as HTML. A backend that cannot render a given swatch
+    returns `None`, and the swatch is rendered as a PNG instead.
+    """
+
+    NAME = ''
+
+    @abstractmethod
+    def render(
+        self, colors, border, border2, height, width,
+        border_size, check_size, max_colors, alpha, border_map,
+        gamut_space, mode
+    ):
+        """Render the swatch as HTML."""
+
+
+class PNGSwatchBackend(SwatchBackend):
+    """Render swatches as base64 encoded PNG images."""
+
+    NAME = 'png'
+
+    def render(
+        self, colors, border, border2, height, width,
+        border_size, check_size, max_colors, alpha, border_map,
+        gamut_space, mode
+    ):
+        """Render the swatch as HTML."""
+
+        return '<img src="data:image/png;base64,{}">'.format(
+            base64.b64encode(
+                color_box_raw(
+                    colors, border, border2, height, width,
+                    border_size, check_size, max_colors, alpha, border_map,
+                    gamut_space, mode
+                )
+            ).decode('ascii')
+        )
+
+
+class HTMLSwatchBackend(SwatchBackend):
+    """
+    Render swatches as styled inline blocks.
 
-    return '<img src="data:image/png;base64,{}">'.format(
-        base64.b64encode(color_box_raw(*args, **kwargs)).decode('ascii')
+    There is no image to encode, but only opaque colors can be shown this way
+    as transparent colors need a checkerboard to show through.
+    """
+
+    NAME = 'html'
+
+    BLOCK = '<span style="display: inline-block; {}">{}</span>'
+
+    def render(
+        self, colors, border, border2, height, width,
+        border_size, check_size, max_colors, alpha, border_map,
+        gamut_space, mode
+    ):
+        """Render the swatch as HTML."""
+
+        colors = colors[:max_colors]
+        if alpha or not colors or any(alg.no_nan(c.alpha) != 1 for c in colors):
+            return None
+
+        if border is None:
+            border = Color(gamut_space, [1, 1, 1])
+
+        color_height = height - (border_size * get_border_size(Y, border_map))
+        color_width = width - (border_size * get_border_size(X, border_map))
+        dividers = get_dividers(color_width, len(colors))
+
+        # Lay out the colors like the image does: each color is `dividers` wide, and the last gets what is left.
+        blocks = []
+        x = 0
+        for color in colors:
+            if x >= color_width:
+                break
+            end = min(color_width, x + dividers)
+            blocks.append(
+                self.BLOCK.format(
+                    'width: {}px; height: {}px; background-color: {};'.format(
+                        end - x, color_height, self.to_hex(color)
+                    ),
+                    ''
+                )
+            )
+            x = end
+        html = ''.join(blocks)
+
+        # Borders wrap the colors, the inner border first.
+        border1_size, border2_size = get_border_sizes(border_size, border2 is not None)
+        if border2 is not None and border2_size:
+            html = self.BLOCK.format(self.border_style(border2, border2_size, border_map), html)
+        if border1_size:
+            html = self.BLOCK.format(self.border_style(border, border1_size, border_map), html)
+        return html
+
+    @staticmethod
+    def to_hex(color):
+        """Get the color as hex."""
+
+        return '#{:02x}{:02x}{:02x}'.format(*[process_channel(c, 255) for c in alg.no_nans(color.coords())])
+
+    def border_style(self, color, size, border_map):
+        """Get the style for a border of the given size on the sides in the border map."""
+
+        return 'border-style: solid; border-color: {}; border-width: {}px {}px {}px {}px;'.format(
+            self.to_hex(color),
+            size if border_map & TOP else 0,
+            size if border_map & RIGHT else 0,
+            size if border_map & BOTTOM else 0,
+            size if border_map & LEFT else 0
+        )
+
+
+backends = {}
+backend = None
+
+
+def register_backend(swatch_backend):
+    """Register a swatch backend."""
+
+    if not isinstance(swatch_backend, SwatchBackend):
+        raise TypeError("Cannot register swatch backend of type '{}'".format(type(swatch_backend)))
+    backends[swatch_backend.NAME] = swatch_backend
+
+
+def set_backend(name):
+    """Set the backend used to render swatches, PNG is used if the backend is not known."""
+
+    global backend
+
+    backend = backends.get(name, backends[PNGSwatchBackend.NAME])
+
+
+register_backend(PNGSwatchBackend())
+register_backend(HTMLSwatchBackend())
+set_backend(PNGSwatchBackend.NAME)
+
+
+def color_box(
+    colors, border=None, border2=None, height=32, width=32,
+    border_size=1, check_size=4, max_colors=5, alpha=False, border_map=0xF,
+    gamut_space='srgb'
+):
+    """Generate palette preview as HTML."""
+
+    mode = png_mode
+    swatch_backend = backend
+    key = (
+        tuple(color_key(c) for c in colors[:max_colors]),
+        color_key(border) if border is not None else None,
+        color_key(border2) if border2 is not None else None,
+        height, width, border_size, check_size, alpha, border_map, gamut_space, mode, swatch_backend.NAME
     )
+
+    html = swatch_cache.get(key)
+    if html is None:
+        args = (
+            colors, border, border2, height, width,
+            border_size, check_size, max_colors, alpha, border_map,
+            gamut_space, mode
+        )
+        html = swatch_backend.render(*args)
+        if html is None:
+            html = backends[PNGSwatchBackend.NAME].render(*args)
+        swatch_cache.set(key, html)
+    return html
@@ -0,0 +1,93 @@
+"""Test the fixed size 3x3 kernels against the generic matrix functions."""
+import unittest
+import random
+from lib.coloraide import algebra as alg
+from lib.coloraide import cat
+from lib.coloraide import util
+
+
+def random_value(rand):
+    """Get a random value, mixing in zeros of both signs and integers."""
+
+    return rand.choice((rand.uniform(-3, 3), rand.uniform(-3, 3), 0.0, -0.0, 0, 1))
+
+
+def random_matrix(rand):
+    """Get a random 3x3 matrix."""
+
+    return [[random_value(rand) for _ in range(3)] for _ in range(3)]
+
+
+class TestKernels(unittest.TestCase):
+    """
+    Test that the kernels give exactly the same results as the generic functions.
+
+    Results are compared with `repr` so that the sign of zero and `int` results must match too.
+    """
+
+    COUNT = 2000
+
+    def setUp(self):
+        """Setup."""
+
+        self.rand = random.Random(1)
+
+    def test_matmul3x3_vec3(self):
+        """Test matrix and vector dot product."""
+
+        for _ in range(self.COUNT):
+            m = random_matrix(self.rand)
+            v = [random_value(self.rand) for _ in range(3)]
+            self.assertEqual(repr(alg.matmul3x3_vec3(m, v)), repr(alg.dot(m, v, dims=alg.D2_D1)))
+            self.assertEqual(repr(alg.matmul3x3_vec3(m, v)), repr(alg.dot(m, v)))
+
+    def test_matmul3x3(self):
+        """Test matrix dot product."""
+
+        for _ in range(self.COUNT):
+            a = random_matrix(self.rand)
+            b = random_matrix(self.rand)
+            self.assertEqual(repr(alg.matmul3x3(a, b)), repr(alg.dot(a, b, dims=alg.D2)))
+            self.assertEqual(repr(alg.matmul3x3(a, b)), repr(alg.dot(a, b)))
+
+    def test_matmul3x3_chain(self):
+        """Test that chaining matches `multi_dot` for three matrices."""
+
+        for _ in range(self.COUNT):
+            a = random_matrix(self.rand)
+            b = random_matrix(self.rand)
+            c = random_matrix(self.rand)
+            self.assertEqual(repr(alg.matmul3x3(a, alg.matmul3x3(b, c))), repr(alg.multi_dot([a, b, c])))
+
+    def test_inv3x3(self):
+        """Test matrix inverse, including singular matrices."""
+
+        singular = 0
+        for _ in range(self.COUNT):
+            m = random_matrix(self.rand)
+            try:
+                expected = repr(alg.inv(m))
+            except ValueError:
+                singular += 1
+                with self.assertRaises(ValueError):
+                    alg.inv3x3(m)
+                continue
+            self.assertEqual(repr(alg.inv3x3(m)), expected)
+        self.assertTrue(singular)
+
+    def test_adaptation_matrices(self):
+        """Test the chromatic adaptation matrices, which are built with the kernels, against the generic functions."""
+
+        whites = list(cat.WHITES['2deg'].values())
+        for method, m in cat.CATS.items():
+            for w1 in whites:
+                for w2 in whites:
+                    if w1 == w2:
+                        continue
+                    first = alg.dot(m, util.xy_to_xyz(w1), dims=alg.D2_D1)
+                    second = alg.dot(m, util.xy_to_xyz(w2), dims=alg.D2_D1)
+                    mi = alg.inv(m)
+                    expected = alg.multi_dot([mi, alg.diag(alg.divide(first, second, dims=alg.D1)), m])
+                    adapt, adapt_inv = cat.calc_adaptation_matrices(w1, w2, method)
+                    self.assertEqual(repr(adapt), repr(expected))
+                    self.assertEqual(repr(adapt_inv), repr(alg.inv(expected)))
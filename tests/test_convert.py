@@ -0,0 +1,96 @@
+"""Test that conversion plans give the same results as running each conversion step."""
+import unittest
+import math
+from lib.coloraide import Color, cat
+from lib.coloraide import algebra as alg
+from lib.coloraide import convert
+
+# Colors with enough chroma that hues are well defined in every space.
+SRGB = (
+    [0.8, 0.2, 0.1],
+    [0.1, 0.6, 0.3],
+    [0.2, 0.3, 0.9],
+    [0.9, 0.85, 0.2],
+    [0.4, 0.1, 0.5]
+)
+
+
+def convert_by_steps(color, space):
+    """Convert the color by running each color space's own `to_base` and `from_base`, one at a time."""
+
+    cs_map = Color.CS_MAP
+    method = Color.CHROMATIC_ADAPTATION
+
+    # The chain from the target to XYZ D65
+    chain = [cs_map[space]]
+    while chain[-1].NAME != convert.ABSOLUTE_BASE:
+        chain.append(cs_map[chain[-1].BASE])
+    names = [s.NAME for s in chain]
+
+    current = type(color._space)
+    coords = alg.no_nans(color.coords())
+    while current.NAME not in names:
+        base = cs_map[current.BASE]
+        coords = current.to_base(coords)
+        if base.NAME == convert.ABSOLUTE_BASE:
+            coords = cat.chromatic_adaptation(current.WHITE, base.WHITE, coords, method)
+        current = base
+
+    index = names.index(current.NAME)
+    if current.NAME == convert.ABSOLUTE_BASE and index:
+        coords = cat.chromatic_adaptation(current.WHITE, chain[index - 1].WHITE, coords, method)
+    for s in reversed(chain[:index]):
+        coords = s.from_base(coords)
+    return coords
+
+
+class TestConvert(unittest.TestCase):
+    """Test conversion plans."""
+
+    def assert_coords_close(self, coords1, coords2, msg):
+        """Assert that the coordinates are the same, apart from floating point error."""
+
+        self.assertEqual(len(coords1), len(coords2), msg)
+        for a, b in zip(coords1, coords2):
+            self.assertTrue(
+                math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9),
+                '{}: {} != {}'.format(msg, coords1, coords2)
+            )
+
+    def test_all_space_pairs(self):
+        """Test that fused plans give the same result as running each step, for every pair of color spaces."""
+
+        for source in Color.CS_MAP:
+            colors = [Color('srgb', rgb).convert(source) for rgb in SRGB]
+            for target in Color.CS_MAP:
+                if target == source:
+                    continue
+                for color in colors:
+                    self.assert_coords_close(
+                        convert.convert(color, target),
+                        convert_by_steps(color, target),
+                        '{} -> {}'.format(source, target)
+                    )
+
+    def test_convert_many(self):
+        """Test that batch conversion gives the same result as converting each color."""
+
+        for source in Color.CS_MAP:
+            colors = [Color('srgb', rgb).convert(source) for rgb in SRGB]
+            for target in ('srgb', 'display-p3', 'lab', 'oklch'):
+                self.assertEqual(
+                    Color.convert_many([c.coords() for c in colors], source, target),
+                    [convert.convert(c, target) for c in colors]
+                )
+
+    def test_fused(self):
+        """Test that consecutive linear steps, including chromatic adaptation, are fused into one matrix."""
+
+        for source, target in (('xyz-d65', 'srgb-linear'), ('xyz-d50', 'srgb-linear'), ('srgb-linear', 'xyz-d50')):
+            plan = convert.build_plan(Color, Color.CS_MAP[source], target)
+            self.assertEqual(len(plan), 1, '{} -> {}'.format(source, target))
+            self.assertIsInstance(plan[0], convert.Transform)
+
+        # Transfer functions still run in order between the fused matrices.
+        plan = convert.build_plan(Color, Color.CS_MAP['srgb'], 'display-p3')
+        self.assertEqual([isinstance(step, convert.Transform) for step in plan], [False, True, False])
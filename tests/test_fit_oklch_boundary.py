@@ -0,0 +1,113 @@
+"""Test the Oklch boundary gamut mapping against the other gamut mapping methods."""
+import unittest
+import statistics
+from lib.coloraide import Color
+from lib.coloraide.gamut.fit_oklch_boundary import LMS_TO_LINEAR_RGB
+
+SPACES = ('srgb', 'display-p3', 'rec2020', 'a98-rgb')
+
+# Oklch colors covering all hues with chroma that is mostly out of gamut.
+COLORS = [
+    Color('oklch', [lightness / 10, chroma / 10, hue])
+    for lightness in range(1, 10)
+    for chroma in range(1, 5)
+    for hue in range(0, 360, 45)
+]
+
+
+def boundary_chroma(color, space):
+    """Find the largest in gamut chroma at the color's Oklch lightness and hue by bisection."""
+
+    mapcolor = color.convert('oklch')
+    low = 0.0
+    high = mapcolor.chroma
+    for _ in range(50):
+        mapcolor.chroma = (low + high) * 0.5
+        if mapcolor.in_gamut(space, tolerance=0):
+            low = mapcolor.chroma
+        else:
+            high = mapcolor.chroma
+    return low
+
+
+class TestOklchBoundary(unittest.TestCase):
+    """Test Oklch boundary gamut mapping."""
+
+    # The other methods stop once the clipped color is within a JND of the reduced color,
+    # so they are expected to land close to the boundary, but not on it.
+    MAX_DELTA_E = 0.06
+
+    # LCh chroma keeps the CIELCh hue, which drifts from the Oklch hue in the blues,
+    # so only the typical difference is close.
+    MEDIAN_DELTA_E_LCH = 0.04
+    MAX_DELTA_E_LCH = 0.4
+
+    def out_of_gamut(self, space):
+        """Get the test colors that are out of the gamut of the given space."""
+
+        return [color for color in COLORS if not color.in_gamut(space, tolerance=0)]
+
+    def test_in_gamut(self):
+        """Test that fitted colors are in gamut."""
+
+        for space in SPACES:
+            for color in self.out_of_gamut(space):
+                self.assertTrue(color.convert(space, fit='oklch-boundary').in_gamut(space, tolerance=0))
+
+    def test_boundary(self):
+        """Test that chroma is reduced to the gamut boundary, keeping lightness and hue."""
+
+        for space in SPACES:
+            for color in self.out_of_gamut(space):
+                fitted = color.convert(space, fit='oklch-boundary').convert('oklch')
+                self.assertAlmostEqual(fitted.lightness, color.lightness, places=6)
+                self.assertAlmostEqual(fitted.chroma, boundary_chroma(color, space), places=6)
+                if fitted.chroma > 1e-4:
+                    self.assertAlmostEqual((fitted.hue - color.hue + 180) % 360 - 180, 0, places=3)
+
+    def test_oklch_chroma(self):
+        """Test against Oklch chroma reduction."""
+
+        for space in SPACES:
+            for color in self.out_of_gamut(space):
+                fitted = color.convert(space, fit='oklch-boundary')
+                expected = color.convert(space, fit='oklch-chroma')
+                self.assertLessEqual(fitted.delta_e(expected, method='ok'), self.MAX_DELTA_E)
+
+    def test_css_color_4(self):
+        """Test against the CSS Color Level 4 gamut mapping."""
+
+        for space in SPACES:
+            for color in self.out_of_gamut(space):
+                fitted = color.convert(space, fit='oklch-boundary')
+                expected = color.convert(space, fit='css-color-4')
+                self.assertLessEqual(fitted.delta_e(expected, method='ok'), self.MAX_DELTA_E)
+
+    def test_lch_chroma(self):
+        """Test against LCh chroma reduction."""
+
+        for space in SPACES:
+            distances = [
+                color.convert(space, fit='oklch-boundary').delta_e(color.convert(space, fit='lch-chroma'), method='ok')
+                for color in self.out_of_gamut(space)
+            ]
+            self.assertLessEqual(statistics.median(distances), self.MEDIAN_DELTA_E_LCH)
+            self.assertLessEqual(max(distances), self.MAX_DELTA_E_LCH)
+
+    def test_fallback(self):
+        """Test that spaces without a direct boundary fall back to the CSS Color Level 4 gamut mapping."""
+
+        self.assertNotIn('prophoto-rgb', LMS_TO_LINEAR_RGB)
+        for color in self.out_of_gamut('prophoto-rgb'):
+            self.assertEqual(
+                color.convert('prophoto-rgb', fit='oklch-boundary'),
+                color.convert('prophoto-rgb', fit='css-color-4')
+            )
+
+    def test_gamut_check_space(self):
+        """Test that spaces that are gamut checked in an RGB space use its boundary."""
+
+        for color in self.out_of_gamut('srgb'):
+            fitted = color.convert('hsl', fit='oklch-boundary')
+            expected = color.convert('srgb', fit='oklch-boundary')
+            self.assertLess(fitted.delta_e(expected, method='ok'), 1e-9)
@@ -0,0 +1,75 @@
+"""
+Test inline preview change tracking.
+
+These tests need Sublime Text and are run with UnitTesting. Elsewhere, they are skipped.
+"""
+import unittest
+
+try:
+    import sublime
+    from unittesting import DeferrableTestCase
+    from .. import ch_preview
+except ImportError:
+    sublime = None
+    DeferrableTestCase = unittest.TestCase
+
+
+@unittest.skipIf(sublime is None, 'Requires Sublime Text and UnitTesting')
+class TestTextChanges(DeferrableTestCase):
+    """Test that edits are recorded in the buffer's preview index."""
+
+    def setUp(self):
+        """Setup."""
+
+        # Keep the preview scheduler from consuming the changes before they are checked.
+        self.scheduler = ch_preview.ch_preview_scheduler
+        if self.scheduler is not None:
+            self.ignore_all = self.scheduler.ignore_all
+            self.scheduler.ignore_all = True
+
+        self.view = sublime.active_window().new_file()
+        self.view.set_scratch(True)
+
+    def tearDown(self):
+        """Cleanup."""
+
+        ch_preview.ch_previews.pop(self.view.buffer_id(), None)
+        self.view.close()
+        if self.scheduler is not None:
+            self.scheduler.ignore_all = self.ignore_all
+
+    def test_listener_is_applicable(self):
+        """Test that the text change listener attaches to regular buffers."""
+
+        if not ch_preview.TRACK_TEXT_CHANGES:
+            self.skipTest('Text change tracking is not available')
+        self.assertTrue(ch_preview.ColorHelperTextChangeListener.is_applicable(self.view.buffer()))
+
+    def test_edit_is_recorded(self):
+        """Test that editing the buffer records the edited text as dirty."""
+
+        if not ch_preview.TRACK_TEXT_CHANGES:
+            self.skipTest('Text change tracking is not available')
+
+        index = ch_preview.get_preview_index(self.view.buffer_id())
+        self.assertEqual(index.pop_changes(), (False, []))
+
+        self.view.run_command('append', {'characters': 'a { color: #fff; }\n'})
+        yield lambda: index.dirty
+
+        self.assertEqual(index.pop_changes(), (False, [(0, 19)]))
+        self.assertEqual(index.pop_changes(), (False, []))
+
+    def test_text_changed(self):
+        """Test that colors after a change are shifted and the changed text is dirty."""
+
+        index = ch_preview.PreviewIndex()
+        colors = [ch_preview.ColorEntry(11, 14, 'red', None), ch_preview.ColorEntry(30, 34, '#fff', None)]
+        index.update(0, 40, colors, 0)
+
+        # Insert five characters between the two colors.
+        index.text_changed(20, 20, 5)
+
+        self.assertEqual(index.starts, [11, 35])
+        self.assertEqual(index.pop_changes(), (False, [(20, 25)]))
+        self.assertEqual(index.gaps(0, 45), [])